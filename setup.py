@@ -3,6 +3,7 @@ Setup script for Trip Planner Agent
 """
 
 from setuptools import setup, find_packages
+import os
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -10,6 +11,19 @@ with open("README.md", "r", encoding="utf-8") as fh:
 with open("requirements.txt", "r", encoding="utf-8") as fh:
     requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
 
+# Opt-in native build of the pure-Python string-assembly hot path:
+#   TRIP_PLANNER_MYPYC=1 pip install .   (needs mypy installed)
+# The plain .py module is used whenever the extension isn't built.
+ext_modules = []
+if os.environ.get("TRIP_PLANNER_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify([
+        # Only the formatter is compiled; imported modules are type-checked silently
+        "--ignore-missing-imports",
+        "--follow-imports=silent",
+        "src/tools/itinerary_formatter.py",
+    ])
+
 setup(
     name="trip-planner-agent",
     version="1.0.0",
@@ -32,6 +46,7 @@ setup(
     ],
     python_requires=">=3.9",
     install_requires=requirements,
+    ext_modules=ext_modules,
     entry_points={
         "console_scripts": [
             "trip-planner=src.main:main",
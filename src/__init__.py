@@ -11,22 +11,40 @@ __version__ = "2.0.0-capstone"
 __author__ = "Liad C."
 __course__ = "Google AI Agents Intensive - November 2025"
 
-# Main orchestrator (auto-loads lite/pro agents based on model)
-from .agents.orchestrator_capstone import OrchestratorAgentCapstone as OrchestratorAgent
-from .agents.exploration_agent import ExplorationAgent
+import importlib
 
+# Data models (lightweight - pydantic only)
+from .models import TripInput, TripPreferences, TripItinerary, TripDates, DayPlan, ResearchData, ReviewResult
+
+# Agents, tools and evaluation pull in the full ADK stack, so they are
+# resolved on first attribute access (PEP 562) instead of at import time.
+# This keeps `python -m src.planner_main` usage errors and light submodule
+# imports fast.
+#
 # Note: Individual agents (Research, Planning, Review) are dynamically loaded
 # by the orchestrator based on model tier. See agents/README.md for details.
+_LAZY_EXPORTS = {
+    # Main orchestrator (auto-loads lite/pro agents based on model)
+    'OrchestratorAgent': ('.agents.orchestrator_capstone', 'OrchestratorAgentCapstone'),
+    'ExplorationAgent': ('.agents.exploration_agent', 'ExplorationAgent'),
+    # Tools
+    'get_weather_info': ('.tools.adk_builtin_tools', 'get_weather_info'),
+    'calculate_trip_budget': ('.tools.adk_builtin_tools', 'calculate_trip_budget'),
+    'ItineraryFormatter': ('.tools.itinerary_formatter', 'ItineraryFormatter'),
+    # Evaluation
+    'TripPlannerEvaluator': ('.evaluation', 'TripPlannerEvaluator'),
+    'evaluate_agent': ('.evaluation', 'evaluate_agent'),
+}
 
-# Data models
-from .models import TripInput, TripPreferences, TripItinerary, TripDates, DayPlan, ResearchData, ReviewResult
 
-# Tools
-from .tools.adk_builtin_tools import get_weather_info, calculate_trip_budget
-from .tools.itinerary_formatter import ItineraryFormatter
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module_name, attr = _LAZY_EXPORTS[name]
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+        globals()[name] = value  # Cache so __getattr__ runs once per name
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Evaluation
-from .evaluation import TripPlannerEvaluator, evaluate_agent
 
 __all__ = [
     # Agents
@@ -16,6 +16,7 @@ from src.config import Config
 from src.models.trip_models import TripInput, TripItinerary, ReviewResult
 from src.utils.model_helper import create_gemini_model
 from rich.console import Console
+from typing import Optional
 import asyncio
 from datetime import datetime
 import re
@@ -134,9 +135,10 @@ class ReviewAgentLite:
         self,
         trip_input: TripInput,
         itinerary: TripItinerary,
-        iteration: int = 1
+        iteration: int = 1,
+        run_id: Optional[str] = None
     ) -> ReviewResult:
-        """Review itinerary"""
+        """Review itinerary (every call gets its own session, so run_id is unused)"""
         console.print(f"\n[bold blue]📋 Reviewing itinerary (iteration {iteration})...[/bold blue]")
         
         user_id = "user_" + datetime.now().strftime("%Y%m%d_%H%M%S")
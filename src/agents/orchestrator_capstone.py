@@ -254,7 +254,8 @@ class OrchestratorAgentCapstone:
                 review_result = await self.review_agent.review(
                     trip_input,
                     current_itinerary,
-                    iteration
+                    iteration,
+                    run_id=session_id  # Iterations of this run share one review session
                 )
                 
                 review_time = (datetime.now() - review_start).total_seconds()
@@ -4,6 +4,9 @@ Uses LoopAgent for iterative refinement!
 """
 
 from google.adk.agents import Agent, LoopAgent
+from google.adk.agents.context_cache_config import ContextCacheConfig
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.apps import App
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.adk.memory import InMemoryMemoryService
@@ -11,41 +14,126 @@ from google.genai import types
 from src.config import Config
 from src.models.trip_models import TripInput, TripItinerary, ReviewResult
 from src.utils.model_helper import create_gemini_model
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.prefilter import prefilter_issues, prescore, PRESCORE_REJECT_BELOW
 from rich.console import Console
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import asyncio
-from datetime import datetime
+import difflib
+import json
+import re
+import sys
+import itertools
+from datetime import date
+
+# Headless workers (batch/eval fan-out) skip Rich rendering entirely
+console = Console(quiet=not sys.stdout.isatty())
+
+# Compiled once - every review parses a score. Prefer the anchored
+# QUALITY SCORE line; decimals matter ("8.5/10" must not parse as 5)
+_QUALITY_SCORE_RE = re.compile(r'QUALITY SCORE:\**\s*(\d+(?:\.\d+)?)\s*(?:/\s*10|out of 10)', re.IGNORECASE)
+_SCORE_RE = re.compile(r'(?<![\d.])(\d+(?:\.\d+)?)(?:/10| out of 10)', re.IGNORECASE)
+_DECISION_RE = re.compile(r'DECISION:\**\s*(APPROVED|NEEDS REVISION)', re.IGNORECASE)
+
+
+def _extract_score(text: str) -> Optional[float]:
+    """Quality score from a review, or None if the model didn't give one"""
+    match = _QUALITY_SCORE_RE.search(text) or _SCORE_RE.search(text)
+    return min(float(match.group(1)), 10.0) if match else None
+
+# Issue heuristics: keyword -> issue label, matched in a single pass
+_ISSUE_KEYWORDS = {
+    "timing": "Timing/scheduling concerns",
+    "schedule": "Timing/scheduling concerns",
+    "budget": "Budget alignment issues",
+    "cost": "Budget alignment issues",
+    "balance": "Activity balance needs improvement",
+}
+_ISSUE_ORDER = list(dict.fromkeys(_ISSUE_KEYWORDS.values()))
+# One capturing group per label, so m.lastindex identifies the issue directly
+_ISSUE_RE = re.compile(
+    "|".join(
+        "(" + "|".join(kw for kw, label in _ISSUE_KEYWORDS.items() if label == issue) + ")"
+        for issue in _ISSUE_ORDER
+    ),
+    re.IGNORECASE
+)
+_ALL_ISSUES_MASK = (1 << len(_ISSUE_ORDER)) - 1
+
+# Static scaffolding of the review query; only the trip fields vary
+_QUERY_TMPL = """Review this trip itinerary (Iteration {iteration}/{max_iterations}).
 
-console = Console()
+**Trip Requirements:**
+- Destination: {destination}
+- Duration: {duration_days} days
+- Budget: {budget_level}
+- Pace: {pace}
+- Interests: {interests}
 
+**Itinerary to Review:**
+{itinerary_text}
 
-class ReviewAgentPro:
-    """
-    Review Agent using ADK's LoopAgent pattern.
-    
-    This agent reviews itineraries and provides feedback for refinement.
-    
-    Capstone Features:
-    - LoopAgent for iterative refinement (up to N iterations)
-    - Quality checks and validation
-    - Sessions & Memory management
-    - Structured feedback
-    """
-    
-    def __init__(self, observability_plugin=None):
-        self.app_name = "trip_planner_review"
-        self.session_service = InMemorySessionService()
-        self.memory_service = InMemoryMemoryService()
-        self.observability_plugin = observability_plugin  # Store plugin
-        
-        # Create ADK Agent
-        self.reviewer_agent = Agent(
-            name="review_agent",
-            model=create_gemini_model(),  # Using model with retry configuration
-            description=(
-                "Expert travel reviewer who evaluates itineraries for quality, "
-                "feasibility, and traveler satisfaction."
-            ),
-            instruction=f"""You are an expert travel itinerary reviewer.
+Total Cost: ${total_cost:.2f}
+
+**Your Task:**
+1. Evaluate against all review criteria
+2. Assign quality score (1-10)
+3. List specific issues (if any)
+4. Provide improvement suggestions
+5. Decide: APPROVE or REQUEST REVISION
+
+Be thorough but fair. Consider this is iteration {iteration} of {max_iterations}.
+
+Provide structured feedback with clear YES/NO on approval.
+"""
+
+_APP_NAME = "trip_planner_review"
+
+# Shared by every reviewer instance so sessions/memory grow with trips, not agents
+_SHARED_SESSION_SERVICE = InMemorySessionService()
+_SHARED_MEMORY_SERVICE = InMemoryMemoryService()
+
+# Unique per process - timestamps collide when trips are reviewed concurrently
+_USER_IDS = itertools.count(1)
+
+# Batch review: several independent itineraries per Gemini request
+_BATCH_QUERY_TMPL = """Review the following {count} itineraries independently, applying the same rubric to each.
+
+{items}
+
+Respond with ONLY a JSON array of {count} objects, in the same order (index 0..{last_index}).
+Each object has the keys: "quality_score" (number 0-10), "issues_found" (list of strings),
+"suggestions" (list of strings), "review_summary" (string, 2-3 sentences)."""
+
+_BATCH_ITEM_TMPL = """### Itinerary {index}
+- Destination: {destination}
+- Duration: {duration_days} days
+- Budget: {budget_level}
+- Pace: {pace}
+- Interests: {interests}
+
+{itinerary_text}"""
+
+# Itinerary text budget per review query
+_MAX_ITINERARY_CHARS = 2000
+
+
+def _truncate_at_boundary(text: str, limit: int) -> str:
+    """Truncate text to `limit` chars, backing off to a line or sentence end"""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    boundary = max(cut.rfind("\n"), cut.rfind(". "))
+    if boundary > limit // 2:
+        cut = cut[:boundary + 1]
+    return cut.rstrip() + "..."
+
+
+@lru_cache(maxsize=1)
+def _review_instruction(today: date) -> str:
+    """Build the reviewer system instruction (cached per day)"""
+    return f"""You are an expert travel itinerary reviewer.
 
 Your mission: Evaluate trip itineraries and provide constructive feedback.
 
@@ -216,40 +304,136 @@ If seeing NO improvement after feedback → score HARSHLY!
 
 Be constructive and specific. If revision needed, explain exactly what to improve.
 
-Current date: {datetime.now().strftime("%Y-%m-%d")}
-""",
-            tools=[]  # Review agent doesn't need external tools
-        )
-        
-        # Wrap in LoopAgent for iterative refinement
-        self.loop_agent = LoopAgent(
-            name="review_loop",
-            sub_agents=[self.reviewer_agent],  # LoopAgent takes a LIST of sub_agents
-            max_iterations=Config.MAX_REVIEW_ITERATIONS,
-            description="Iterative review loop for itinerary refinement"
-        )
-        
-        # Create runner
-        # Register observability plugin if provided
-        plugins = []
-        if self.observability_plugin:
-            plugins.append(self.observability_plugin)
+Current date: {today}
+"""
+
+
+def _escalate_if_approved(approval_threshold: float):
+    """
+    Build an after_model_callback that ends the LoopAgent once a pass approves.
+    
+    Without it, an approving first pass is followed by redundant reviewer
+    calls until max_iterations is reached.
+    """
+    def callback(callback_context, llm_response):
+        if llm_response.content and llm_response.content.parts:
+            score = _extract_score(llm_response.content.parts[0].text or "")
+            if score is not None and score >= approval_threshold:
+                callback_context.actions.escalate = True
+        return None  # Keep the model response unchanged
+    return callback
+
+
+@lru_cache(maxsize=8)
+def _build_review_stack(
+    model_name: str,
+    temperature: float,
+    max_iterations: int,
+    approval_threshold: float,
+    today: date,
+    observability_plugin=None,
+    enable_context_cache: bool = False
+) -> Tuple[Runner, Agent, LoopAgent]:
+    """
+    Build (runner, reviewer agent, loop agent) once per configuration.
+    
+    The arguments are the cache key: the stack is rebuilt only when the
+    model, tier settings, date (baked into the instruction), plugin or
+    context-cache setting change.
+    """
+    # Create ADK Agent
+    reviewer_agent = Agent(
+        name="review_agent",
+        model=create_gemini_model(model_name, temperature),  # Using model with retry configuration
+        description=(
+            "Expert travel reviewer who evaluates itineraries for quality, "
+            "feasibility, and traveler satisfaction."
+        ),
+        instruction=_review_instruction(today),
+        tools=[],  # Review agent doesn't need external tools
+        after_model_callback=_escalate_if_approved(approval_threshold)  # Stop the loop once approved
+    )
+    
+    # Wrap in LoopAgent for iterative refinement
+    loop_agent = LoopAgent(
+        name="review_loop",
+        sub_agents=[reviewer_agent],  # LoopAgent takes a LIST of sub_agents
+        max_iterations=max_iterations,
+        description="Iterative review loop for itinerary refinement"
+    )
+    
+    # Create runner
+    # Register observability plugin if provided
+    plugins = []
+    if observability_plugin:
+        plugins.append(observability_plugin)
+    
+    # Context caching: the static rubric is uploaded once and billed at the
+    # cached-token rate on later calls instead of being resent every time
+    app = App(
+        name=_APP_NAME,
+        root_agent=loop_agent,
+        plugins=plugins,  # ✅ Plugin registered - auto-tracks all agent/tool calls!
+        context_cache_config=ContextCacheConfig(
+            min_tokens=1024,  # Gemini's minimum cacheable prompt size
+            ttl_seconds=3600
+        ) if enable_context_cache else None
+    )
+    runner = Runner(
+        app=app,
+        session_service=_SHARED_SESSION_SERVICE,
+        memory_service=_SHARED_MEMORY_SERVICE
+    )
+    return runner, reviewer_agent, loop_agent
+
+
+class ReviewAgentPro:
+    """
+    Review Agent using ADK's LoopAgent pattern.
+    
+    This agent reviews itineraries and provides feedback for refinement.
+    
+    Capstone Features:
+    - LoopAgent for iterative refinement (up to N iterations)
+    - Quality checks and validation
+    - Sessions & Memory management
+    - Structured feedback
+    """
+    
+    def __init__(self, observability_plugin=None):
+        self.app_name = _APP_NAME
+        self.session_service = _SHARED_SESSION_SERVICE
+        self.memory_service = _SHARED_MEMORY_SERVICE
+        self.observability_plugin = observability_plugin  # Store plugin
+        self._limiter = get_rate_limiter()  # Shared Gemini QPM/TPM budget
+        # (destination, start_date, run_id) -> future of (user_id, session_id)
+        self._sessions: Dict[Tuple[str, str, str], "asyncio.Future[Tuple[str, str]]"] = {}
+        self._last_itinerary_text: Dict[str, str] = {}  # session_id -> text last sent (truncated)
+        # Resolve tier-aware settings once (matches the orchestrator's loop bound)
+        self.max_iterations = Config.get_max_iterations()
+        self.approval_threshold = Config.get_approval_threshold()
+        self._batch_runner: Optional[Runner] = None  # Built on first review_batch()
         
-        self.runner = Runner(
-            agent=self.loop_agent,
-            app_name=self.app_name,
-            session_service=self.session_service,
-            memory_service=self.memory_service,
-            plugins=plugins  # ✅ Plugin registered - auto-tracks all agent/tool calls!
+        # ADK stack is shared by every reviewer with the same configuration
+        self.runner, self.reviewer_agent, self.loop_agent = _build_review_stack(
+            Config.MODEL_NAME,
+            Config.TEMPERATURE,
+            self.max_iterations,
+            self.approval_threshold,
+            date.today(),
+            observability_plugin,
+            Config.ENABLE_CONTEXT_CACHE
         )
         
-        console.print(f"[green]✅ Review Agent initialized (max {Config.MAX_REVIEW_ITERATIONS} iterations)![/green]")
+        console.print(f"[green]✅ Review Agent initialized (max {self.max_iterations} iterations)![/green]")
     
     async def review(
         self,
         trip_input: TripInput,
         itinerary: TripItinerary,
-        iteration: int = 1
+        iteration: int = 1,
+        decision_only: bool = False,
+        run_id: Optional[str] = None
     ) -> ReviewResult:
         """
         Review an itinerary.
@@ -258,22 +442,36 @@ Current date: {datetime.now().strftime("%Y-%m-%d")}
             trip_input: Original trip parameters
             itinerary: Itinerary to review
             iteration: Current review iteration
+            decision_only: Stream the response and stop as soon as the score
+                line arrives (skips the detailed feedback)
+            run_id: Identifies one refinement loop; its iterations share a
+                session. None reviews in a fresh session
             
         Returns:
             ReviewResult with feedback and approval status
         """
         console.print(f"\n[bold blue]📋 Reviewing itinerary (iteration {iteration})...[/bold blue]")
         
-        # Create session
-        user_id = "user_" + datetime.now().strftime("%Y%m%d_%H%M%S")
-        session = await self.session_service.create_session(
-            app_name=self.app_name,
-            user_id=user_id
-        )
-        session_id = session.id
+        # Structurally broken output can be rejected without a Gemini call
+        if prescore(itinerary.generated_itinerary) < PRESCORE_REJECT_BELOW:
+            issues = prefilter_issues(itinerary.generated_itinerary)
+            console.print(f"[yellow]⚠️  Pre-filter rejected itinerary: {', '.join(issues)}[/yellow]")
+            return ReviewResult(
+                approved=False,
+                quality_score=3.0,
+                issues_found=issues,
+                suggestions=["Regenerate a complete day-by-day itinerary with times and cost estimates."],
+                review_summary="Rejected by structural pre-filter: " + "; ".join(issues),
+                iteration_number=iteration
+            )
+        
+        # Reuse the run's session across refinement iterations
+        user_id, session_id = await self._get_or_create_session(trip_input, run_id)
         
-        # Create review query
-        query = self._create_review_query(trip_input, itinerary, iteration)
+        # Create review query (diffs only make sense within a run's session)
+        query = self._create_review_query(
+            trip_input, itinerary, iteration, session_id if run_id is not None else None
+        )
         
         # Run agent
         content = types.Content(
@@ -283,22 +481,37 @@ Current date: {datetime.now().strftime("%Y-%m-%d")}
         
         console.print("[yellow]Agent is reviewing... (this may take 20-30 seconds)[/yellow]")
         
-        # Collect response
+        # Collect response (wait for quota instead of triggering 429 backoff)
+        # Token estimate: ~4 chars per token plus the reviewer's response budget
         response_text = ""
-        async for event in self.runner.run_async(
-            user_id=user_id,
-            session_id=session_id,
-            new_message=content
-        ):
-            # Track any tool calls (though review agent typically doesn't use tools)
-            if event.get_function_calls():
-                for fc in event.get_function_calls():
-                    console.print(f"  [dim]🔧 Review agent using tool: {fc.name}[/dim]")
-            
-            if event.is_final_response():
-                if event.content and event.content.parts:
-                    response_text = event.content.parts[0].text
-                break
+        run_config = RunConfig(
+            streaming_mode=StreamingMode.SSE if decision_only else StreamingMode.NONE
+        )
+        async with self._limiter.acquire(estimated_tokens=len(query) // 4 + 2000):
+            async for event in self.runner.run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=content,
+                run_config=run_config
+            ):
+                # Track any tool calls (though review agent typically doesn't use tools)
+                if event.get_function_calls():
+                    for fc in event.get_function_calls():
+                        console.print(f"  [dim]🔧 Review agent using tool: {fc.name}[/dim]")
+                
+                # Fast path: approval depends only on the score, which the
+                # output format puts right after the DECISION line
+                if decision_only and event.partial:
+                    if event.content and event.content.parts:
+                        response_text += event.content.parts[0].text or ""
+                        if _SCORE_RE.search(response_text):
+                            break
+                    continue
+                
+                if event.is_final_response():
+                    if event.content and event.content.parts:
+                        response_text = event.content.parts[0].text
+                    break
         
         # Parse response into ReviewResult
         review_result = self._parse_review_response(response_text, iteration)
@@ -312,67 +525,234 @@ Current date: {datetime.now().strftime("%Y-%m-%d")}
         
         return review_result
     
+    async def review_batch(
+        self,
+        items: List[Tuple[TripInput, TripItinerary]],
+        k: int = 5
+    ) -> List[ReviewResult]:
+        """
+        Review many independent itineraries, `k` per Gemini request.
+        
+        Meant for offline/evaluation use: on RPM-limited tiers this turns
+        N calls into ceil(N/k). A chunk whose JSON can't be parsed falls
+        back to one review() call per itinerary.
+        
+        Args:
+            items: (trip_input, itinerary) pairs to review
+            k: Itineraries per request
+            
+        Returns:
+            One ReviewResult per item, in input order
+        """
+        results: List[ReviewResult] = []
+        for start in range(0, len(items), k):
+            chunk = items[start:start + k]
+            console.print(f"\n[bold blue]📋 Batch reviewing itineraries {start + 1}-{start + len(chunk)}...[/bold blue]")
+            
+            chunk_results = await self._review_chunk(chunk)
+            if chunk_results is None:
+                console.print("[yellow]⚠️  Batch output unparseable, reviewing individually[/yellow]")
+                chunk_results = [await self.review(trip, itin) for trip, itin in chunk]
+            results.extend(chunk_results)
+        
+        return results
+    
+    async def _review_chunk(
+        self,
+        chunk: List[Tuple[TripInput, TripItinerary]]
+    ) -> Optional[List[ReviewResult]]:
+        """Review one chunk in a single request; None if the output is unusable"""
+        if self._batch_runner is None:
+            batch_agent = Agent(
+                name="batch_review_agent",
+                model=create_gemini_model(),
+                description="Reviews several itineraries per request and returns JSON.",
+                instruction=_review_instruction(date.today()),
+                generate_content_config=types.GenerateContentConfig(
+                    response_mime_type="application/json"
+                ),
+                tools=[]
+            )
+            self._batch_runner = Runner(
+                agent=batch_agent,
+                app_name=self.app_name,
+                session_service=self.session_service,
+                memory_service=self.memory_service
+            )
+        
+        items_text = "\n\n".join(
+            _BATCH_ITEM_TMPL.format(
+                index=i,
+                destination=trip.destination,
+                duration_days=trip.dates.duration_days,
+                budget_level=trip.preferences.budget_level,
+                pace=trip.preferences.pace_preference,
+                interests=', '.join(trip.preferences.interests) or 'general',
+                itinerary_text=_truncate_at_boundary(itin.generated_itinerary, _MAX_ITINERARY_CHARS)
+            )
+            for i, (trip, itin) in enumerate(chunk)
+        )
+        query = _BATCH_QUERY_TMPL.format(count=len(chunk), items=items_text, last_index=len(chunk) - 1)
+        
+        # Independent trips - a fresh session per chunk
+        session = await self.session_service.create_session(
+            app_name=self.app_name,
+            user_id="batch_review"
+        )
+        content = types.Content(role='user', parts=[types.Part(text=query)])
+        
+        response_text = ""
+        async with self._limiter.acquire(estimated_tokens=len(query) // 4 + 1000 * len(chunk)):
+            async for event in self._batch_runner.run_async(
+                user_id="batch_review",
+                session_id=session.id,
+                new_message=content
+            ):
+                if event.is_final_response():
+                    if event.content and event.content.parts:
+                        response_text = event.content.parts[0].text or ""
+                    break
+        
+        try:
+            raw = json.loads(response_text.strip().removeprefix("```json").strip("`"))
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(raw, list) or len(raw) != len(chunk):
+            return None
+        
+        results = []
+        for entry in raw:
+            if not isinstance(entry, dict):
+                return None
+            try:
+                score = float(entry.get("quality_score", 7.0))
+            except (TypeError, ValueError):
+                return None
+            score = min(max(score, 0.0), 10.0)
+            results.append(ReviewResult(
+                approved=score >= self.approval_threshold,
+                quality_score=score,
+                issues_found=[str(i) for i in entry.get("issues_found", [])],
+                suggestions=[str(s) for s in entry.get("suggestions", [])],
+                review_summary=str(entry.get("review_summary", "")),
+                iteration_number=1
+            ))
+        return results
+    
+    async def _get_or_create_session(self, trip_input: TripInput, run_id: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Get the (user_id, session_id) for a refinement run, creating it on first review.
+        
+        Iterations of the same run share one session so the reviewer keeps
+        its earlier feedback in context. The creation future is registered
+        before the first await, so concurrent reviews of one run share it.
+        """
+        if run_id is None:
+            return await self._create_session()
+        
+        run_key = (trip_input.destination, trip_input.dates.start_date, run_id)
+        future = self._sessions.get(run_key)
+        if future is None:
+            future = self._sessions[run_key] = asyncio.ensure_future(self._create_session())
+        try:
+            return await future
+        except Exception:
+            if self._sessions.get(run_key) is future:
+                del self._sessions[run_key]  # Let the next review retry
+            raise
+    
+    async def _create_session(self) -> Tuple[str, str]:
+        """Create a review session under a fresh user id"""
+        user_id = f"user_{next(_USER_IDS)}"
+        session = await self.session_service.create_session(
+            app_name=self.app_name,
+            user_id=user_id
+        )
+        return user_id, session.id
+    
     def _create_review_query(
         self,
         trip_input: TripInput,
         itinerary: TripItinerary,
-        iteration: int
+        iteration: int,
+        session_id: Optional[str] = None
     ) -> str:
-        """Create detailed review query"""
-        query = f"""Review this trip itinerary (Iteration {iteration}/{Config.MAX_REVIEW_ITERATIONS}).
-
-**Trip Requirements:**
-- Destination: {trip_input.destination}
-- Duration: {trip_input.dates.duration_days} days
-- Budget: {trip_input.preferences.budget_level}
-- Pace: {trip_input.preferences.pace_preference}
-- Interests: {', '.join(trip_input.preferences.interests) if trip_input.preferences.interests else 'general'}
-
-**Itinerary to Review:**
-{itinerary.generated_itinerary[:2000]}...
-
-Total Cost: ${itinerary.total_estimated_cost:.2f}
-
-**Your Task:**
-1. Evaluate against all review criteria
-2. Assign quality score (1-10)
-3. List specific issues (if any)
-4. Provide improvement suggestions
-5. Decide: APPROVE or REQUEST REVISION
-
-Be thorough but fair. Consider this is iteration {iteration} of {Config.MAX_REVIEW_ITERATIONS}.
-
-Provide structured feedback with clear YES/NO on approval.
-"""
-        return query
+        """
+        Create detailed review query.
+        
+        On refinement iterations the session already holds the previous
+        version, so only a unified diff of the changes is sent. The diff is
+        taken between the truncated texts the reviewer actually received,
+        so nothing beyond the cut is presented as already-reviewed context.
+        """
+        # What the reviewer gets to see of this version
+        current_view = _truncate_at_boundary(itinerary.generated_itinerary, _MAX_ITINERARY_CHARS)
+        previous_view = self._last_itinerary_text.get(session_id) if session_id else None
+        
+        itinerary_text = current_view
+        if iteration > 1 and previous_view:
+            diff = "\n".join(difflib.unified_diff(
+                previous_view.splitlines(),
+                current_view.splitlines(),
+                fromfile=f"iteration_{iteration - 1}",
+                tofile=f"iteration_{iteration}",
+                n=2,
+                lineterm=""
+            ))
+            # Only when the whole diff fits - previous view + diff must equal current view
+            if diff and len(diff) < len(current_view):
+                itinerary_text = (
+                    "Only the changes since the previous iteration are shown "
+                    "(unified diff); unchanged sections were already reviewed.\n\n"
+                    + diff
+                )
+        
+        if session_id:
+            self._last_itinerary_text[session_id] = current_view
+        
+        interests = trip_input.preferences.interests
+        return _QUERY_TMPL.format(
+            iteration=iteration,
+            max_iterations=self.max_iterations,
+            destination=trip_input.destination,
+            duration_days=trip_input.dates.duration_days,
+            budget_level=trip_input.preferences.budget_level,
+            pace=trip_input.preferences.pace_preference,
+            interests=', '.join(interests) if interests else 'general',
+            itinerary_text=itinerary_text,
+            total_cost=itinerary.total_estimated_cost
+        )
     
     def _parse_review_response(self, response_text: str, iteration: int) -> ReviewResult:
         """Parse agent response into structured ReviewResult"""
         
-        response_lower = response_text.lower()
-        
-        # Extract quality score FIRST (look for patterns like "score: 8" or "8/10")
-        import re
-        score_match = re.search(r'(\d+)(?:/10| out of 10)', response_lower)
-        quality_score = float(score_match.group(1)) if score_match else 7.0
+        # Extract quality score FIRST (the QUALITY SCORE line, else any "8/10")
+        quality_score = _extract_score(response_text)
+        if quality_score is None:
+            # No score given - trust only the explicit DECISION line, never
+            # loose wording like "would not approve"
+            decision = _DECISION_RE.search(response_text)
+            if decision and decision.group(1).upper() == "APPROVED":
+                quality_score = self.approval_threshold
+            else:
+                quality_score = 7.0
         
         # STRICT approval logic based on score (per instructions):
         # 8+/10 = APPROVE
         # 7/10 and below = NEEDS REVISION
         
         # Approval based strictly on score, no exceptions
-        threshold = Config.get_approval_threshold()
-        approved = quality_score >= threshold
+        approved = quality_score >= self.approval_threshold
         
-        # Extract issues (simple heuristic)
+        # Extract issues (simple heuristic) - one regex pass over the text
         issues = []
         if not approved:
-            if "timing" in response_lower or "schedule" in response_lower:
-                issues.append("Timing/scheduling concerns")
-            if "budget" in response_lower or "cost" in response_lower:
-                issues.append("Budget alignment issues")
-            if "balance" in response_lower:
-                issues.append("Activity balance needs improvement")
+            found = 0  # bitmask over _ISSUE_ORDER
+            for m in _ISSUE_RE.finditer(response_text):
+                found |= 1 << (m.lastindex - 1)
+                if found == _ALL_ISSUES_MASK:
+                    break
+            issues = [issue for i, issue in enumerate(_ISSUE_ORDER) if found >> i & 1]
         
         # Extract suggestions (use full response if not approved)
         suggestions = [response_text] if not approved else ["Great itinerary! Minor polishing suggestions included."]
@@ -388,14 +768,25 @@ Provide structured feedback with clear YES/NO on approval.
 
 
 # Convenience function for standalone use
+# Shared reviewer for the standalone helper - building the Agent/Runner is not free
+_review_agent: Optional[ReviewAgentPro] = None
+_review_agent_lock: Optional[asyncio.Lock] = None
+
+
 async def review_itinerary(
     trip_input: TripInput,
     itinerary: TripItinerary,
-    iteration: int = 1
+    iteration: int = 1,
+    run_id: Optional[str] = None
 ) -> ReviewResult:
     """Standalone function to review an itinerary"""
-    agent = ReviewAgentCapstone()
-    return await agent.review(trip_input, itinerary, iteration)
+    global _review_agent, _review_agent_lock
+    if _review_agent_lock is None:
+        _review_agent_lock = asyncio.Lock()
+    async with _review_agent_lock:
+        if _review_agent is None:
+            _review_agent = ReviewAgentPro()
+    return await _review_agent.review(trip_input, itinerary, iteration, run_id=run_id)
 
 
 if __name__ == "__main__":
@@ -15,6 +15,12 @@ class Config:
     GOOGLE_AI_API_KEY = os.getenv("GOOGLE_AI_API_KEY")
     
     OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")  # Optional - for real-time weather
+    # Seconds to reuse a processed trip forecast; 0 disables
+    WEATHER_CACHE_TTL = int(os.getenv("WEATHER_CACHE_TTL", "1800"))
+    # Raw forecast per coordinate is reused for 30 min; geocodes never expire.
+    # Both persist across CLI runs in SQLite (set WEATHER_CACHE_DB="" to keep them in memory)
+    WEATHER_FORECAST_TTL = int(os.getenv("WEATHER_FORECAST_TTL", "1800"))
+    WEATHER_CACHE_DB = os.getenv("WEATHER_CACHE_DB", "~/.cache/argonauts/weather.sqlite")
     ENABLE_GOOGLE_MAPS_LINKS = os.getenv("ENABLE_GOOGLE_MAPS_LINKS", "true").lower() == "true"
     
     # ===== MODEL CONFIGURATION =====
@@ -59,7 +65,17 @@ class Config:
     RETRY_ATTEMPTS = int(os.getenv("RETRY_ATTEMPTS", "5"))
     RETRY_EXP_BASE = int(os.getenv("RETRY_EXP_BASE", "7"))
     RETRY_INITIAL_DELAY = int(os.getenv("RETRY_INITIAL_DELAY", "1"))
-    
+
+    # Proactive throttling (free tier defaults) - set GEMINI_QPM=0 to disable
+    GEMINI_QPM = int(os.getenv("GEMINI_QPM", "15"))
+    GEMINI_TPM = int(os.getenv("GEMINI_TPM", "250000"))
+
+    # Hide per-agent/per-tool progress lines (errors, warnings and summaries still print)
+    OBSERVABILITY_QUIET = os.getenv("OBSERVABILITY_QUIET", "false").lower() == "true"
+
+    # Max concurrent reviews when evaluating a batch of itineraries
+    EVAL_CONCURRENCY = int(os.getenv("EVAL_CONCURRENCY", "4"))
+
     # ===== AGENT SETTINGS =====
     # Now dynamically determined by model tier
     # For backward compatibility, set these as class attributes
@@ -72,11 +88,14 @@ class Config:
     ENABLE_CODE_EXECUTION = os.getenv("ENABLE_CODE_EXECUTION", "true").lower() == "true"
     ENABLE_OBSERVABILITY = os.getenv("ENABLE_OBSERVABILITY", "true").lower() == "true"
     ENABLE_EVALUATION = os.getenv("ENABLE_EVALUATION", "true").lower() == "true"
+    ENABLE_CONTEXT_CACHE = os.getenv("ENABLE_CONTEXT_CACHE", "true").lower() == "true"
     
     # ===== OBSERVABILITY =====
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     ENABLE_TRACING = os.getenv("ENABLE_TRACING", "true").lower() == "true"
     ENABLE_METRICS = os.getenv("ENABLE_METRICS", "true").lower() == "true"
+    # Older metrics_*.json files are gzipped; compressed ones past this age are deleted (0 keeps all)
+    METRICS_RETENTION_DAYS = int(os.getenv("METRICS_RETENTION_DAYS", "30"))
     
     @classmethod
     def validate(cls):
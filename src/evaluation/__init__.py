@@ -1,6 +1,6 @@
 """Evaluation system for Trip Planner Agent"""
 
-from .evaluator import TripPlannerEvaluator, evaluate_agent
+from .evaluator import TripPlannerEvaluator, evaluate_agent, evaluate_batch
 
-__all__ = ['TripPlannerEvaluator', 'evaluate_agent']
+__all__ = ['TripPlannerEvaluator', 'evaluate_agent', 'evaluate_batch']
 
@@ -10,9 +10,58 @@ This module evaluates the trip planner agent system on multiple dimensions:
 Part of the capstone project evaluation requirements.
 """
 
-from typing import Dict, Any
-from src.models.trip_models import TripInput, TripItinerary
+from typing import Dict, Any, Callable, List, NamedTuple, Optional, Tuple
+from src.config import Config
+from src.models.trip_models import BudgetLevel, TripInput, TripItinerary
 from datetime import datetime
+from bisect import bisect_right
+import asyncio
+import re
+
+# Weights for the overall score, in the order evaluate() computes them
+_SCORE_WEIGHTS = (
+    ("performance", 0.2),
+    ("quality", 0.4),
+    ("feature_coverage", 0.2),
+    ("user_satisfaction", 0.2),
+)
+
+# Expected daily spend per budget level. BudgetLevel is a str enum, so plain
+# strings like "mid-range" hash to the same keys and unknown levels fall back
+_BUDGET_EXPECTED = {
+    BudgetLevel.BUDGET: 100,
+    BudgetLevel.MID_RANGE: 200,
+    BudgetLevel.LUXURY: 400,
+}
+
+# (score key, threshold, recommendation when the score falls below it)
+_RECOMMENDATION_RULES = (
+    ("performance", 7,
+     "Consider caching research results or using faster models for improved performance."),
+    ("quality", 7,
+     "Improve itinerary quality by adding more detailed activities and practical information."),
+    ("feature_coverage", 7,
+     "Utilize more ADK features like code_execution, memory persistence, and observability."),
+    ("user_satisfaction", 8,
+     "Enhance user satisfaction by better matching preferences and providing richer content."),
+)
+
+# Grade bins, ascending: score >= threshold[i] earns label[i + 1]
+_GRADE_THRESHOLDS = [6.0, 7.0, 8.0, 9.0]
+_GRADE_LABELS = [
+    "D (Needs Improvement)",
+    "C (Acceptable)",
+    "B (Good)",
+    "A (Very Good)",
+    "A+ (Excellent)",
+]
+
+
+class DayPlanStats(NamedTuple):
+    """Aggregates over an itinerary's day plans, gathered in one pass"""
+    total_activities: int
+    n_days: int
+    all_morning_afternoon: bool
 
 
 class TripPlannerEvaluator:
@@ -50,6 +99,14 @@ class TripPlannerEvaluator:
                 "loop_agent"
             ]
         }
+        perf = self.evaluation_criteria["performance"]
+        self._perf_targets = (perf["research_speed"], perf["planning_speed"], perf["total_time"])
+        self._required_features_lc = tuple(f.lower() for f in self.evaluation_criteria["features"])
+        # Longest first so a feature that prefixes another can't shadow it
+        self._feature_re = re.compile(
+            "|".join(re.escape(f) for f in sorted(self._required_features_lc, key=len, reverse=True)),
+            re.IGNORECASE
+        )
     
     def evaluate(
         self,
@@ -86,11 +143,14 @@ class TripPlannerEvaluator:
             "review_iterations": metrics.get("review_iterations", 0)
         }
         
+        # Walk the day plans once for both quality and satisfaction
+        day_stats = self._scan_day_plans(itinerary.day_plans)
+        
         # 2. Quality Evaluation
-        quality_score = self._evaluate_quality(trip_input, itinerary)
+        quality_score = self._evaluate_quality(trip_input, itinerary, day_stats)
         evaluation["scores"]["quality"] = quality_score
         evaluation["details"]["quality"] = {
-            "num_day_plans": len(itinerary.day_plans),
+            "num_day_plans": day_stats.n_days,
             "budget": itinerary.total_estimated_cost,
             "packing_list_items": len(itinerary.packing_list),
             "important_notes": len(itinerary.important_notes)
@@ -102,20 +162,15 @@ class TripPlannerEvaluator:
         evaluation["details"]["features_used"] = metrics.get("features_used", [])
         
         # 4. User Satisfaction Proxy
-        satisfaction_score = self._evaluate_satisfaction(trip_input, itinerary)
+        satisfaction_score = self._evaluate_satisfaction(trip_input, itinerary, day_stats)
         evaluation["scores"]["user_satisfaction"] = satisfaction_score
         
-        # Calculate overall score
-        weights = {
-            "performance": 0.2,
-            "quality": 0.4,
-            "feature_coverage": 0.2,
-            "user_satisfaction": 0.2
-        }
-        
-        overall = sum(
-            evaluation["scores"][key] * weights[key]
-            for key in weights
+        # Calculate overall score (same order as _SCORE_WEIGHTS)
+        overall = (
+            perf_score * _SCORE_WEIGHTS[0][1]
+            + quality_score * _SCORE_WEIGHTS[1][1]
+            + feature_score * _SCORE_WEIGHTS[2][1]
+            + satisfaction_score * _SCORE_WEIGHTS[3][1]
         )
         evaluation["overall_score"] = round(overall, 2)
         evaluation["grade"] = self._get_grade(overall)
@@ -127,48 +182,67 @@ class TripPlannerEvaluator:
     
     def _evaluate_performance(self, metrics: Dict[str, Any]) -> float:
         """Evaluate performance metrics (0-10 scale)"""
-        criteria = self.evaluation_criteria["performance"]
+        research_target, planning_target, total_target = self._perf_targets
+        
+        # Unpack metrics once; missing or None timings count as 1s
+        get = metrics.get
+        research_time = max(get("research_time", 1) or 1, 1)
+        planning_time = max(get("planning_time", 1) or 1, 1)
+        total_time = max(get("total_time", 1) or 1, 1)
+        iterations = get("review_iterations", 1)
         
         # Research speed
-        research_score = min(10, (criteria["research_speed"] / max(metrics.get("research_time", 1), 1)) * 10)
+        research_score = min(10, (research_target / research_time) * 10)
         
         # Planning speed
-        planning_score = min(10, (criteria["planning_speed"] / max(metrics.get("planning_time", 1), 1)) * 10)
+        planning_score = min(10, (planning_target / planning_time) * 10)
         
         # Total time
-        total_score = min(10, (criteria["total_time"] / max(metrics.get("total_time", 1), 1)) * 10)
+        total_score = min(10, (total_target / total_time) * 10)
         
         # Iterations efficiency
-        iterations = metrics.get("review_iterations", 1)
         iteration_score = 10 - (iterations - 1) * 2  # Penalty for more iterations
         
         # Average
         perf_score = (research_score + planning_score + total_score + iteration_score) / 4
         return round(min(10, max(0, perf_score)), 2)
     
-    def _evaluate_quality(self, trip_input: TripInput, itinerary: TripItinerary) -> float:
+    @staticmethod
+    def _scan_day_plans(day_plans) -> DayPlanStats:
+        """Count activities and check morning/afternoon coverage in one pass"""
+        total_activities = 0
+        all_morning_afternoon = True
+        for day in day_plans:
+            total_activities += day.activity_count
+            if all_morning_afternoon and not (day.morning_activities and day.afternoon_activities):
+                all_morning_afternoon = False
+        return DayPlanStats(total_activities, len(day_plans), all_morning_afternoon)
+    
+    def _evaluate_quality(
+        self,
+        trip_input: TripInput,
+        itinerary: TripItinerary,
+        day_stats: Optional[DayPlanStats] = None
+    ) -> float:
         """Evaluate itinerary quality (0-10 scale)"""
+        if day_stats is None:
+            day_stats = self._scan_day_plans(itinerary.day_plans)
         scores = []
         
         # 1. Completeness (all days planned)
-        if itinerary.duration_days == len(itinerary.day_plans):
+        if itinerary.duration_days == day_stats.n_days:
             scores.append(10)
         else:
-            scores.append((len(itinerary.day_plans) / itinerary.duration_days) * 10)
+            scores.append((day_stats.n_days / itinerary.duration_days) * 10)
         
         # 2. Activity richness
-        total_activities = sum(
-            len(day.morning_activities) + len(day.afternoon_activities) + len(day.evening_activities)
-            for day in itinerary.day_plans
-        )
-        avg_activities = total_activities / max(len(itinerary.day_plans), 1)
+        avg_activities = day_stats.total_activities / max(day_stats.n_days, 1)
         activity_score = min(10, avg_activities * 2)  # Target 5 activities/day
         scores.append(activity_score)
         
         # 3. Budget reasonableness
         daily_budget = itinerary.total_estimated_cost / max(itinerary.duration_days, 1)
-        budget_levels = {"budget": 100, "mid-range": 200, "luxury": 400}
-        expected = budget_levels.get(trip_input.preferences.budget_level, 200)
+        expected = _BUDGET_EXPECTED.get(trip_input.preferences.budget_level, 200)
         budget_diff = abs(daily_budget - expected) / expected
         budget_score = max(0, 10 - (budget_diff * 10))
         scores.append(budget_score)
@@ -181,21 +255,30 @@ class TripPlannerEvaluator:
     
     def _evaluate_features(self, metrics: Dict[str, Any]) -> float:
         """Evaluate ADK feature usage (0-10 scale)"""
-        required_features = self.evaluation_criteria["features"]
         features_used = metrics.get("features_used", [])
         
-        # Count how many required features were used
-        used_count = sum(
-            1 for feature in required_features
-            if any(feature.lower() in str(used).lower() for used in features_used)
-        )
+        # One case-insensitive scan; features are matched as substrings of any entry
+        used_text = "\n".join(map(str, features_used))
+        hits = set()
+        for match in self._feature_re.finditer(used_text):
+            hits.add(match.group(0).lower())
+            if len(hits) == len(self._required_features_lc):
+                break
+        used_count = len(hits)
         
         # Score based on coverage
-        coverage = used_count / len(required_features)
+        coverage = used_count / len(self._required_features_lc)
         return round(coverage * 10, 2)
     
-    def _evaluate_satisfaction(self, trip_input: TripInput, itinerary: TripItinerary) -> float:
+    def _evaluate_satisfaction(
+        self,
+        trip_input: TripInput,
+        itinerary: TripItinerary,
+        day_stats: Optional[DayPlanStats] = None
+    ) -> float:
         """Evaluate user satisfaction proxy (0-10 scale)"""
+        if day_stats is None:
+            day_stats = self._scan_day_plans(itinerary.day_plans)
         scores = []
         
         # 1. Duration match
@@ -217,64 +300,105 @@ class TripPlannerEvaluator:
             scores.append(5)
         
         # 4. All days have plans
-        if all(
-            day.morning_activities and day.afternoon_activities
-            for day in itinerary.day_plans
-        ):
+        if day_stats.all_morning_afternoon:
             scores.append(10)
         else:
             scores.append(7)
         
         return round(sum(scores) / len(scores), 2)
     
-    def _get_grade(self, score: float) -> str:
+    @staticmethod
+    def _get_grade(score: float) -> str:
         """Convert score to letter grade"""
-        if score >= 9.0:
-            return "A+ (Excellent)"
-        elif score >= 8.0:
-            return "A (Very Good)"
-        elif score >= 7.0:
-            return "B (Good)"
-        elif score >= 6.0:
-            return "C (Acceptable)"
-        else:
-            return "D (Needs Improvement)"
+        return _GRADE_LABELS[bisect_right(_GRADE_THRESHOLDS, score)]
     
     def _generate_recommendations(self, evaluation: Dict[str, Any]) -> list:
         """Generate improvement recommendations"""
-        recommendations = []
-        
         scores = evaluation["scores"]
-        
-        if scores.get("performance", 10) < 7:
-            recommendations.append(
-                "Consider caching research results or using faster models for improved performance."
-            )
-        
-        if scores.get("quality", 10) < 7:
-            recommendations.append(
-                "Improve itinerary quality by adding more detailed activities and practical information."
-            )
-        
-        if scores.get("feature_coverage", 10) < 7:
-            recommendations.append(
-                "Utilize more ADK features like code_execution, memory persistence, and observability."
-            )
-        
-        if scores.get("user_satisfaction", 10) < 8:
-            recommendations.append(
-                "Enhance user satisfaction by better matching preferences and providing richer content."
-            )
-        
-        if not recommendations:
-            recommendations.append("Excellent work! All metrics are strong. Consider adding deployment.")
-        
-        return recommendations
+        recommendations = [
+            message for key, threshold, message in _RECOMMENDATION_RULES
+            if scores.get(key, 10) < threshold
+        ]
+        return recommendations or [
+            "Excellent work! All metrics are strong. Consider adding deployment."
+        ]
+
+
+# Evaluator is stateless after __init__, so one instance serves every call
+_evaluator: Optional[TripPlannerEvaluator] = None
+
+
+def get_evaluator() -> TripPlannerEvaluator:
+    """Get or create the shared evaluator"""
+    global _evaluator
+    if _evaluator is None:
+        _evaluator = TripPlannerEvaluator()
+    return _evaluator
 
 
 # Convenience function
 def evaluate_agent(trip_input: TripInput, itinerary: TripItinerary, metrics: dict) -> dict:
     """Standalone evaluation function"""
-    evaluator = TripPlannerEvaluator()
-    return evaluator.evaluate(trip_input, itinerary, metrics)
+    return get_evaluator().evaluate(trip_input, itinerary, metrics)
 
+
+async def evaluate_batch(
+    cases: List[Tuple[TripInput, TripItinerary, dict]],
+    reviewer=None,
+    concurrency: Optional[int] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None
+) -> List[dict]:
+    """
+    Evaluate many cases concurrently, optionally running the reviewer on each.
+    
+    Reviews dominate the cost (20-30s each), so they are fanned out under a
+    semaphore instead of awaited one by one; the shared rate limiter still
+    applies inside each review.
+    
+    Args:
+        cases: (trip_input, itinerary, metrics) triples
+        reviewer: Optional agent with an async review(trip_input, itinerary)
+        concurrency: Max reviews in flight (default: Config.EVAL_CONCURRENCY)
+        on_progress: Called with (completed, total) as each case finishes
+        
+    Returns:
+        Evaluation results in the same order as `cases`
+    
+    Raises:
+        The first exception from a review; the remaining cases are cancelled
+    """
+    evaluator = get_evaluator()
+    semaphore = asyncio.Semaphore(concurrency or Config.EVAL_CONCURRENCY)
+    
+    async def run_case(index: int, trip_input: TripInput, itinerary: TripItinerary, metrics: dict):
+        evaluation = evaluator.evaluate(trip_input, itinerary, metrics)
+        if reviewer is not None:
+            async with semaphore:
+                review = await reviewer.review(trip_input, itinerary)
+            evaluation["review"] = {
+                "approved": review.approved,
+                "quality_score": review.quality_score,
+                "issues_found": review.issues_found
+            }
+        return index, evaluation
+    
+    tasks = [
+        asyncio.create_task(run_case(i, *case))
+        for i, case in enumerate(cases)
+    ]
+    results: List[Optional[dict]] = [None] * len(tasks)
+    
+    completed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, evaluation = await next_done
+            results[index] = evaluation
+            completed += 1
+            if on_progress:
+                on_progress(completed, len(tasks))
+    finally:
+        # Don't leave reviews running (or their errors unretrieved) after a failure
+        for task in tasks:
+            task.cancel()
+    
+    return results
@@ -13,7 +13,6 @@ import asyncio
 import sys
 from pathlib import Path
 
-from src.agents.exploration_agent import ExplorationAgent
 from rich.console import Console
 from rich.panel import Panel
 import argparse
@@ -42,6 +41,9 @@ def main():
     
     args = parser.parse_args()
     
+    # Imported after argument parsing so --help doesn't load the ADK stack
+    from src.agents.exploration_agent import ExplorationAgent
+    
     # Run exploration
     agent = ExplorationAgent()
     result = asyncio.run(agent.explore(
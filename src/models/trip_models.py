@@ -3,9 +3,10 @@ Data models for the Trip Planner Agent system.
 Defines all the structured data types used across agents.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict
-from datetime import date
+from datetime import date, datetime
+from functools import cached_property
 from enum import Enum
 
 
@@ -18,13 +19,14 @@ class BudgetLevel(str, Enum):
 
 class TripDates(BaseModel):
     """Trip date range"""
+    model_config = ConfigDict(frozen=True)  # Immutable once validated
+    
     start_date: str = Field(..., description="Trip start date (YYYY-MM-DD)")
     end_date: str = Field(..., description="Trip end date (YYYY-MM-DD)")
     
-    @property
+    @cached_property
     def duration_days(self) -> int:
-        """Calculate number of days in the trip"""
-        from datetime import datetime
+        """Calculate number of days in the trip (parsed once per instance)"""
         start = datetime.fromisoformat(self.start_date)
         end = datetime.fromisoformat(self.end_date)
         return (end - start).days + 1
@@ -32,6 +34,8 @@ class TripDates(BaseModel):
 
 class TripPreferences(BaseModel):
     """User preferences for the trip"""
+    model_config = ConfigDict(frozen=True)  # Immutable once validated
+    
     interests: List[str] = Field(
         default_factory=list,
         description="User's interests (e.g., temples, food, nature, shopping)"
@@ -52,10 +56,22 @@ class TripPreferences(BaseModel):
         default=None,
         description="Any special requests or considerations"
     )
+    
+    @cached_property
+    def interests_str(self) -> str:
+        """Comma-separated interests (joined once per instance)"""
+        return ", ".join(self.interests)
+    
+    @cached_property
+    def dietary_restrictions_str(self) -> str:
+        """Comma-separated dietary restrictions (joined once per instance)"""
+        return ", ".join(self.dietary_restrictions)
 
 
 class TripInput(BaseModel):
     """Input from user for trip planning - Capstone version"""
+    model_config = ConfigDict(frozen=True)  # Immutable once validated
+    
     destination: str = Field(..., description="Primary destination")
     dates: TripDates = Field(..., description="Trip dates")
     preferences: TripPreferences = Field(
@@ -72,10 +88,17 @@ class TripInput(BaseModel):
         default=None,
         description="Paths to reference files (friend's itineraries)"
     )
+    
+    @cached_property
+    def additional_destinations_str(self) -> str:
+        """Comma-separated additional destinations, "" if none (joined once per instance)"""
+        return ", ".join(self.additional_destinations or ())
 
 
 class DayActivity(BaseModel):
     """A single activity in the itinerary"""
+    model_config = ConfigDict(frozen=True)  # Immutable once validated
+    
     time: str = Field(..., description="Time of activity (e.g., '9:00 AM')")
     activity: str = Field(..., description="Activity description")
     location: str = Field(..., description="Location name")
@@ -86,6 +109,8 @@ class DayActivity(BaseModel):
 
 class DayPlan(BaseModel):
     """Plan for a single day - Capstone version"""
+    model_config = ConfigDict(frozen=True)  # Immutable once validated
+    
     day_number: int
     date: str = Field(..., description="Date (YYYY-MM-DD)")
     title: str = Field(default="", description="Title for the day")
@@ -111,6 +136,11 @@ class DayPlan(BaseModel):
     activities: List[DayActivity] = Field(default_factory=list)
     accommodation: Optional[str] = Field(default=None, description="Where to stay")
     transportation_notes: Optional[str] = Field(default=None, description="Transportation notes")
+    
+    @cached_property
+    def activity_count(self) -> int:
+        """Total morning + afternoon + evening activities (counted once)"""
+        return len(self.morning_activities) + len(self.afternoon_activities) + len(self.evening_activities)
 
 
 class WeatherInfo(BaseModel):
@@ -154,6 +184,8 @@ class ResearchData(BaseModel):
 
 class TripItinerary(BaseModel):
     """Complete trip itinerary - Capstone version"""
+    model_config = ConfigDict(frozen=True)  # Immutable once validated
+    
     destination: str
     start_date: str
     end_date: str
@@ -18,6 +18,8 @@ Course: Google AI Agents Intensive (Nov 2025)
 """
 
 import asyncio
+import json
+import os
 import sys
 import yaml
 from pathlib import Path
@@ -29,9 +31,19 @@ from rich import print as rprint
 
 from src.config import Config
 from src.models.trip_models import TripInput
-from src.agents.orchestrator_capstone import OrchestratorAgentCapstone
-from src.tools.itinerary_formatter import ItineraryFormatter
-from src.evaluation.evaluator import TripPlannerEvaluator
+
+# Optional: C-accelerated JSON for the evaluation dump
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# LibYAML-backed loader when PyYAML was built with it (same safe semantics)
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 console = Console()
 
@@ -60,6 +72,13 @@ def display_welcome():
     Config.print_config_info()
 
 
+def _write_atomic(path: Path, data: bytes):
+    """Write via a temp file + os.replace so a crash never leaves a truncated file"""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
 def load_trip_input(yaml_file: Path) -> TripInput:
     """Load trip input from YAML file"""
     console.print(f"\n[cyan]📂 Loading trip request from: {yaml_file}[/cyan]")
@@ -67,7 +86,7 @@ def load_trip_input(yaml_file: Path) -> TripInput:
     from src.utils.error_handler import validate_trip_input
     
     with open(yaml_file, 'r') as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=_YamlLoader)
     
     trip_input = TripInput(**data)
     
@@ -79,6 +98,10 @@ def load_trip_input(yaml_file: Path) -> TripInput:
 
 async def main_async(yaml_file: Path, output_dir: Path):
     """Main async workflow"""
+    # Imported here so usage/file-not-found errors don't load the ADK stack
+    from src.agents.orchestrator_capstone import OrchestratorAgentCapstone
+    from src.tools.itinerary_formatter import ItineraryFormatter
+    from src.evaluation.evaluator import TripPlannerEvaluator
     
     # Display welcome
     display_welcome()
@@ -96,11 +119,10 @@ async def main_async(yaml_file: Path, output_dir: Path):
     try:
         itinerary = await orchestrator.plan_trip(trip_input)
         
-        # Save output
-        output_file = output_dir / f"itinerary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-        markdown = ItineraryFormatter.to_markdown(itinerary)
-        
-        output_file.write_text(markdown)
+        # Save output (one timestamp so itinerary/evaluation files pair up)
+        run_stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_file = output_dir / f"itinerary_{run_stamp}.md"
+        _write_atomic(output_file, ItineraryFormatter.to_markdown_bytes(itinerary))
         console.print(f"\n[green]✅ Itinerary saved to: {output_file}[/green]")
         
         # Evaluation (if enabled)
@@ -114,9 +136,12 @@ async def main_async(yaml_file: Path, output_dir: Path):
             )
             
             # Save evaluation
-            eval_file = output_dir / f"evaluation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            import json
-            eval_file.write_text(json.dumps(eval_results, indent=2))
+            eval_file = output_dir / f"evaluation_{run_stamp}.json"
+            if ORJSON_AVAILABLE:
+                eval_bytes = orjson.dumps(eval_results, option=orjson.OPT_INDENT_2)
+            else:
+                eval_bytes = json.dumps(eval_results, indent=2).encode("utf-8")
+            _write_atomic(eval_file, eval_bytes)
             console.print(f"[blue]📊 Evaluation saved to: {eval_file}[/blue]")
             
             # Display evaluation summary
@@ -1,16 +1,30 @@
 """Tools for the Trip Planner Agent system - Capstone Version"""
 
-# ADK built-in tools (capstone version)
-from .adk_builtin_tools import (
-    google_search,
-    get_weather_info,
-    calculate_trip_budget,
-    search_destination_info
-)
+import importlib
+
+# The ADK built-in tools pull in google.adk/genai (~2s), so exports are
+# resolved on first attribute access (PEP 562) - importing a light
+# submodule such as src.tools.maps_helper no longer pays for it.
+_LAZY_EXPORTS = {
+    # ADK built-in tools
+    'google_search': ('.adk_builtin_tools', 'google_search'),
+    'get_weather_info': ('.adk_builtin_tools', 'get_weather_info'),
+    'calculate_trip_budget': ('.adk_builtin_tools', 'calculate_trip_budget'),
+    'search_destination_info': ('.adk_builtin_tools', 'search_destination_info'),
+    # Utility tools
+    'WeatherTool': ('.weather_tool', 'WeatherTool'),
+    'ItineraryFormatter': ('.itinerary_formatter', 'ItineraryFormatter'),
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module_name, attr = _LAZY_EXPORTS[name]
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+        globals()[name] = value  # Cache so __getattr__ runs once per name
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Utility tools
-from .weather_tool import WeatherTool
-from .itinerary_formatter import ItineraryFormatter
 
 __all__ = [
     # ADK built-in tools
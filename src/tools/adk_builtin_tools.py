@@ -8,8 +8,9 @@ This module wraps ADK's built-in tools for easy use in our agents:
 NO EXTERNAL APIs NEEDED - ALL ADK BUILT-IN!
 """
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from datetime import date
+from functools import lru_cache
 import json
 
 # ===== ADK BUILT-IN TOOLS =====
@@ -44,10 +45,21 @@ def get_weather_info(destination: str, start_date: str, end_date: str) -> Dict:
     Returns:
         A dictionary containing weather information.
     """
+    # Fresh dict (and list) per call so callers can't mutate the cached result
+    weather = dict(_cached_weather(destination, start_date, end_date))
+    weather["recommendations"] = list(weather["recommendations"])
+    return weather
+
+
+@lru_cache(maxsize=512)
+def _cached_weather(destination: str, start_date: str, end_date: str) -> Tuple:
+    """Cached lookup behind get_weather_info (agents re-query the same trip window)"""
     start = date.fromisoformat(start_date)
     end = date.fromisoformat(end_date)
     
-    return _weather_tool.get_weather(destination, start, end)
+    weather = _weather_tool.get_weather(destination, start, end)
+    weather["recommendations"] = tuple(weather["recommendations"])
+    return tuple(weather.items())
 
 
 def search_destination_info(query: str) -> str:
@@ -89,50 +101,10 @@ def calculate_trip_budget(
     Returns:
         Budget breakdown dictionary
     """
-    # Daily costs by budget level
-    daily_costs = {
-        "budget": {
-            "accommodation": 50,
-            "food": 30,
-            "activities": 20,
-            "transport": 15
-        },
-        "mid-range": {
-            "accommodation": 120,
-            "food": 60,
-            "activities": 50,
-            "transport": 30
-        },
-        "luxury": {
-            "accommodation": 300,
-            "food": 150,
-            "activities": 150,
-            "transport": 80
-        }
-    }
-    
-    costs = daily_costs.get(budget_level, daily_costs["mid-range"])
-    
-    # Calculate totals
-    total_accommodation = costs["accommodation"] * num_days * num_people
-    total_food = costs["food"] * num_days * num_people
-    total_activities = costs["activities"] * num_days * num_people
-    total_transport = costs["transport"] * num_days * num_people
-    
-    subtotal = total_accommodation + total_food + total_activities + total_transport
-    
-    # Add flights if requested
-    flight_cost = 0
-    if include_flights:
-        flight_estimates = {
-            "budget": 500,
-            "mid-range": 800,
-            "luxury": 1500
-        }
-        flight_cost = flight_estimates.get(budget_level, 800) * num_people
-    
-    total = subtotal + flight_cost
+    (total_accommodation, total_food, total_activities, total_transport,
+     flight_cost, subtotal, total) = _budget_totals(num_days, budget_level, num_people, include_flights)
     
+    # Fresh dict per call so callers can't mutate the cached totals
     return {
         "budget_level": budget_level,
         "num_days": num_days,
@@ -151,6 +123,60 @@ def calculate_trip_budget(
     }
 
 
+# Daily costs by budget level
+_DAILY_COSTS = {
+    "budget": {
+        "accommodation": 50,
+        "food": 30,
+        "activities": 20,
+        "transport": 15
+    },
+    "mid-range": {
+        "accommodation": 120,
+        "food": 60,
+        "activities": 50,
+        "transport": 30
+    },
+    "luxury": {
+        "accommodation": 300,
+        "food": 150,
+        "activities": 150,
+        "transport": 80
+    }
+}
+
+# Round-trip flight estimate per person
+_FLIGHT_ESTIMATES = {
+    "budget": 500,
+    "mid-range": 800,
+    "luxury": 1500
+}
+
+
+@lru_cache(maxsize=256)
+def _budget_totals(num_days: int, budget_level: str, num_people: int, include_flights: bool) -> Tuple:
+    """Cached arithmetic behind calculate_trip_budget (returns an immutable tuple)"""
+    costs = _DAILY_COSTS.get(budget_level, _DAILY_COSTS["mid-range"])
+    
+    # Calculate totals (every daily cost scales by the same person-days)
+    person_days = num_days * num_people
+    total_accommodation = costs["accommodation"] * person_days
+    total_food = costs["food"] * person_days
+    total_activities = costs["activities"] * person_days
+    total_transport = costs["transport"] * person_days
+    
+    subtotal = total_accommodation + total_food + total_activities + total_transport
+    
+    # Add flights if requested
+    flight_cost = 0
+    if include_flights:
+        flight_cost = _FLIGHT_ESTIMATES.get(budget_level, 800) * num_people
+    
+    total = subtotal + flight_cost
+    return (total_accommodation, total_food, total_activities, total_transport,
+            flight_cost, subtotal, total)
+
+
 # Export all tools for ADK
 __all__ = [
     'google_search',  # ADK built-in
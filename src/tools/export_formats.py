@@ -5,15 +5,20 @@ Converts markdown itineraries to different formats.
 
 from src.models.trip_models import TripItinerary
 from src.tools.itinerary_formatter import ItineraryFormatter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from rich.console import Console
 from typing import Optional
-import json
 
 console = Console()
 
 
+def _write_utf8(path, text: str):
+    """Encode once and hand the whole buffer to a single binary write"""
+    Path(path).write_bytes(text.encode('utf-8'))
+
+
 class ItineraryExporter:
     """
     Export itineraries to various formats.
@@ -36,7 +41,7 @@ class ItineraryExporter:
         md_content = ItineraryFormatter.to_markdown(itinerary)
         
         if output_path:
-            Path(output_path).write_text(md_content, encoding='utf-8')
+            _write_utf8(output_path, md_content)
             console.print(f"[green]✅ Markdown saved to: {output_path}[/green]")
         
         return md_content
@@ -54,17 +59,11 @@ class ItineraryExporter:
         Returns:
             JSON string
         """
-        # Convert Pydantic model to dict, handling dates
-        def date_serializer(obj):
-            if hasattr(obj, 'isoformat'):
-                return obj.isoformat()
-            raise TypeError(f"Type {type(obj)} not serializable")
-        
-        json_data = itinerary.model_dump(mode='json')
-        json_str = json.dumps(json_data, indent=2, default=date_serializer)
+        # Single pass through pydantic-core's serializer (handles dates natively)
+        json_str = itinerary.model_dump_json(indent=2)
         
         if output_path:
-            Path(output_path).write_text(json_str, encoding='utf-8')
+            _write_utf8(output_path, json_str)
             console.print(f"[green]✅ JSON saved to: {output_path}[/green]")
         
         return json_str
@@ -82,30 +81,27 @@ class ItineraryExporter:
         Returns:
             Plain text string
         """
-        md_content = ItineraryFormatter.to_markdown(itinerary)
-        
-        # Strip markdown formatting
-        text_content = md_content
-        # Remove markdown headers
-        text_content = text_content.replace('###', '')
-        text_content = text_content.replace('##', '')
-        text_content = text_content.replace('#', '')
-        # Remove bold
-        text_content = text_content.replace('**', '')
-        # Remove italic
-        text_content = text_content.replace('_', '')
-        # Remove code blocks
-        text_content = text_content.replace('`', '')
-        # Clean up extra newlines
-        while '\n\n\n' in text_content:
-            text_content = text_content.replace('\n\n\n', '\n\n')
+        text_content = ItineraryExporter._strip_markdown(ItineraryFormatter.to_markdown(itinerary))
         
         if output_path:
-            Path(output_path).write_text(text_content, encoding='utf-8')
+            _write_utf8(output_path, text_content)
             console.print(f"[green]✅ Plain text saved to: {output_path}[/green]")
         
         return text_content
     
+    @staticmethod
+    def _strip_markdown(md_content: str) -> str:
+        """Strip headers, bold, italic and code markers, then collapse blank lines"""
+        # Chained str.replace is deliberate (see ItineraryFormatter.to_plain_text):
+        # each is a memchr-speed C scan, faster than a fused regex or str.translate.
+        # '**' goes before '_' so '*_*' can't turn into a new bold marker
+        text = md_content.replace('#', '').replace('**', '').replace('_', '').replace('`', '')
+        # Clean up extra newlines (a no-op scan when there are no blank-line runs,
+        # which beats a \n{3,} regex pass)
+        while '\n\n\n' in text:
+            text = text.replace('\n\n\n', '\n\n')
+        return text
+    
     @staticmethod
     def export_all(itinerary: TripItinerary, output_dir: str = "output"):
         """
@@ -121,21 +117,17 @@ class ItineraryExporter:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         base_name = f"itinerary_{timestamp}"
         
-        # Export to each format
-        ItineraryExporter.to_markdown(
-            itinerary,
-            str(output_path / f"{base_name}.md")
-        )
-        
-        ItineraryExporter.to_json(
-            itinerary,
-            str(output_path / f"{base_name}.json")
-        )
-        
-        ItineraryExporter.to_plain_text(
-            itinerary,
-            str(output_path / f"{base_name}.txt")
-        )
+        # Render markdown once (plain text is derived from it), then write
+        # the three files concurrently - file writes release the GIL
+        md_content = ItineraryFormatter.to_markdown(itinerary)
+        outputs = [
+            (output_path / f"{base_name}.md", md_content),
+            (output_path / f"{base_name}.json", itinerary.model_dump_json(indent=2)),
+            (output_path / f"{base_name}.txt", ItineraryExporter._strip_markdown(md_content)),
+        ]
+        with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+            # list() surfaces any write error
+            list(executor.map(lambda item: _write_utf8(*item), outputs))
         
         console.print(f"\n[bold green]✅ All formats exported to: {output_dir}/[/bold green]")
         console.print(f"  📄 {base_name}.md (Markdown)")
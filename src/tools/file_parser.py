@@ -12,9 +12,156 @@ Supports parsing various file formats to extract trip planning information:
 This allows users to upload friends' trip plans and use them as reference!
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import re
+import threading
+
+# Optional: Hyperscan multi-pattern scanner for the link/date/cost sweep
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+
+# Patterns are compiled once at import; extractors run them per file
+_URL_RE = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+
+# Look for patterns like "Visit X", "Trip to X", city names in caps
+_DESTINATION_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:visit|trip to|going to|destination:)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s+(?:Japan|France|Italy|UK|USA|Spain|Germany|China)',
+))
+
+# re.ASCII: \d and \s match what Hyperscan matches (ASCII only), so the
+# extracted dates/costs never depend on whether it is installed
+_DATE_RES = tuple(re.compile(p, re.IGNORECASE | re.ASCII) for p in (
+    r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
+    r'\d{2}/\d{2}/\d{4}',  # DD/MM/YYYY or MM/DD/YYYY
+    r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}',  # Month DD, YYYY
+))
+
+_COST_RES = tuple(re.compile(p, re.ASCII) for p in (
+    r'\$\d+(?:,\d{3})*(?:\.\d{2})?',  # $1,234.56
+    r'€\d+(?:,\d{3})*(?:\.\d{2})?',  # €1,234.56
+    r'¥\d+(?:,\d{3})*',  # ¥1,234
+    r'£\d+(?:,\d{3})*(?:\.\d{2})?',  # £1,234.56
+))
+
+# URLs, dates and costs never overlap in practice, so one alternation finds
+# all three in a single pass (dispatch on m.lastgroup). Dates embedded in a
+# URL are consumed as part of the URL rather than reported as trip dates.
+_DATE_PATTERN = "|".join(p.pattern for p in _DATE_RES)
+_COST_PATTERN = "|".join(p.pattern for p in _COST_RES)
+_COMBINED_RE = re.compile("|".join((
+    f"(?P<link>{_URL_RE.pattern})",
+    f"(?P<date>(?i:{_DATE_PATTERN}))",
+    f"(?P<cost>{_COST_PATTERN})",
+)), re.ASCII)
+
+# Byte-level twin of _COMBINED_RE; Hyperscan reports UTF-8 byte offsets
+# (bytes patterns are always ASCII-only, like _COMBINED_RE)
+_COMBINED_RE_BYTES = re.compile(_COMBINED_RE.pattern.encode('utf-8'))
+
+# Common activity keywords, matched in one pass. The match is a zero-width
+# lookahead so overlapping phrases ("visit museum of art" -> Visit + Museum)
+# are all reported, as with one scan per keyword
+_ACTIVITY_KEYWORDS = (
+    'visit', 'see', 'tour', 'explore', 'hike', 'museum', 'temple',
+    'shrine', 'restaurant', 'cafe', 'shopping', 'market', 'park',
+    'beach', 'mountain', 'castle', 'garden'
+)
+_ACTIVITY_RE = re.compile(
+    r'\b(?=(?P<kw>' + '|'.join(_ACTIVITY_KEYWORDS) + r')\s+(?P<what>[a-zA-Z\s]+?)(?:\.|,|\n|$))',
+    re.IGNORECASE
+)
+
+# Extractors and the returned content only look at this many leading characters
+DEFAULT_MAX_SCAN_CHARS = 200_000
+
+# Per-kind caps on the unique values kept from the fused scan
+_COMBINED_LIMITS = {'link': None, 'date': 20, 'cost': 50}
+
+
+def _capped_unique(values, limit: int) -> List[str]:
+    """First `limit` unique values in encounter order, stopping as soon as the cap is hit"""
+    seen = set()
+    out = []
+    for value in values:
+        if value not in seen:
+            seen.add(value)
+            out.append(value)
+            if len(out) == limit:
+                break
+    return out
+
+
+@lru_cache(maxsize=1)
+def _hyperscan_database():
+    """Compile the link/date/cost patterns into one Hyperscan database (once)"""
+    som = hyperscan.HS_FLAG_SOM_LEFTMOST
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    database.compile(
+        expressions=[p.encode('utf-8') for p in (_URL_RE.pattern, _DATE_PATTERN, _COST_PATTERN)],
+        ids=[0, 1, 2],
+        flags=[som, som | hyperscan.HS_FLAG_CASELESS, som],
+    )
+    return database
+
+
+# Scratch space can't be shared by concurrent scans (parse_reference_files uses threads)
+_hyperscan_local = threading.local()
+
+
+def _hyperscan_spans(data: bytes) -> List[Tuple[int, int]]:
+    """Every (leftmost start, end) byte span Hyperscan reports, sorted by start"""
+    database = _hyperscan_database()
+    scratch = getattr(_hyperscan_local, 'scratch', None)
+    if scratch is None:
+        scratch = _hyperscan_local.scratch = hyperscan.Scratch(database)
+    
+    spans = []
+    database.scan(
+        data,
+        match_event_handler=lambda _id, start, end, _flags, _context: spans.append((start, end)),
+        scratch=scratch,
+    )
+    spans.sort()
+    return spans
+
+
+def _iter_combined_matches(content: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (kind, text) for each link/date/cost match, in document order.
+    
+    With Hyperscan installed, its SIMD scan locates candidate spans and
+    _COMBINED_RE_BYTES confirms each one, so results match the plain re
+    sweep while the regex engine never walks text without a match.
+    """
+    if not HYPERSCAN_AVAILABLE:
+        for match in _COMBINED_RE.finditer(content):
+            yield match.lastgroup, match.group()
+        return
+    
+    data = content.encode('utf-8')
+    spans = _hyperscan_spans(data)
+    pos = 0
+    i = 0
+    while True:
+        # Spans ending inside text already consumed can't start the next match
+        while i < len(spans) and spans[i][1] <= pos:
+            i += 1
+        if i == len(spans):
+            return
+        # The next re match can't start before the earliest remaining span
+        match = _COMBINED_RE_BYTES.search(data, max(spans[i][0], pos))
+        if match is None:
+            return
+        yield match.lastgroup, match.group().decode('utf-8')
+        pos = match.end()
 
 
 class FileParser:
@@ -30,8 +177,12 @@ class FileParser:
     - Wanderlog links (shared itineraries)
     """
     
-    def __init__(self):
+    def __init__(self, max_scan_chars: int = DEFAULT_MAX_SCAN_CHARS, keep_structured: bool = False):
         self.supported_formats = ['.txt', '.pdf', '.xlsx', '.docx']
+        # Bounds extraction time and downstream context size for huge documents
+        self.max_scan_chars = max_scan_chars
+        # Keep spreadsheet rows as tuples too (nothing downstream reads them by default)
+        self.keep_structured = keep_structured
     
     def parse_file(self, file_path: str) -> Dict[str, any]:
         """
@@ -45,8 +196,9 @@ class FileParser:
             {
                 'file_name': str,
                 'file_type': str,
-                'content': str,
-                'structured_data': dict (if available),
+                'content': str (first max_scan_chars characters),
+                'total_chars': int (length before truncation),
+                'structured_data': dict (Excel rows, if keep_structured),
                 'links': list (if found),
                 'destinations': list (if identified),
                 'dates': list (if found),
@@ -82,24 +234,27 @@ class FileParser:
     def _parse_txt(self, path: Path) -> Dict:
         """Parse plain text file"""
         try:
-            content = path.read_text(encoding='utf-8')
+            # One read + bulk decode (skips TextIOWrapper); keep read_text's newline handling
+            content = self._decode_text(path.read_bytes())
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
             
-            # Check if it's a link file
-            if self._is_google_maps_link(content):
+            # Check if it's a link file (lowercase once for both checks)
+            content_lower = content.lower()
+            if self._is_google_maps_link(content_lower):
                 return self._parse_google_maps_link(content, path.name)
-            elif self._is_wanderlog_link(content):
+            elif self._is_wanderlog_link(content_lower):
                 return self._parse_wanderlog_link(content, path.name)
             
             # Regular text file
+            scan = content[:self.max_scan_chars]
             return {
                 'file_name': path.name,
                 'file_type': 'text',
-                'content': content,
-                'links': self._extract_links(content),
-                'destinations': self._extract_destinations(content),
-                'dates': self._extract_dates(content),
-                'costs': self._extract_costs(content),
-                'activities': self._extract_activities(content)
+                'content': scan,
+                'total_chars': len(content),
+                **self._extract_all(scan),
+                'activities': self._extract_activities(scan)
             }
         except Exception as e:
             return {
@@ -108,28 +263,36 @@ class FileParser:
                 'content': ''
             }
     
+    @staticmethod
+    def _decode_text(data: bytes) -> str:
+        """
+        Decode a text file strictly: UTF-8, else Windows-1252 (Latin-1 exports).
+        
+        Binary files (e.g. a PDF renamed to .txt) raise instead of parsing
+        as replacement-character soup.
+        """
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError:
+            if b'\x00' in data:
+                raise ValueError("file is binary, not text") from None
+            return data.decode('cp1252')  # Strict: undefined bytes still fail
+    
     def _parse_pdf(self, path: Path) -> Dict:
         """Parse PDF file"""
         try:
-            # Try to import PDF parser
-            try:
-                import PyPDF2
-                with open(path, 'rb') as file:
-                    reader = PyPDF2.PdfReader(file)
-                    content = ""
-                    for page in reader.pages:
-                        content += page.extract_text() + "\n"
-            except ImportError:
+            # Try native PDF engines first (PDFium, MuPDF), then pure-Python PyPDF2
+            content = self._read_pdf_text(path)
+            if content is None:
                 content = f"[PDF: {path.name}] - PyPDF2 not installed. Install with: pip install PyPDF2"
             
+            scan = content[:self.max_scan_chars]
             return {
                 'file_name': path.name,
                 'file_type': 'pdf',
-                'content': content,
-                'links': self._extract_links(content),
-                'destinations': self._extract_destinations(content),
-                'dates': self._extract_dates(content),
-                'costs': self._extract_costs(content)
+                'content': scan,
+                'total_chars': len(content),
+                **self._extract_all(scan)
             }
         except Exception as e:
             return {
@@ -138,40 +301,84 @@ class FileParser:
                 'content': f"[PDF: {path.name}] - Could not parse"
             }
     
+    def _read_pdf_text(self, path: Path) -> Optional[str]:
+        """Extract PDF text with the fastest installed engine, None if none is"""
+        try:
+            import pypdfium2 as pdfium
+            pdf = pdfium.PdfDocument(str(path))
+            try:
+                pages = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    pages.append(textpage.get_text_range())
+                    textpage.close()
+                    page.close()
+            finally:
+                pdf.close()
+            return "".join(text + "\n" for text in pages)
+        except ImportError:
+            pass
+        
+        try:
+            import fitz  # PyMuPDF
+            with fitz.open(path) as doc:
+                return "".join(page.get_text("text") + "\n" for page in doc)
+        except ImportError:
+            pass
+        
+        try:
+            import PyPDF2
+            with open(path, 'rb') as file:
+                reader = PyPDF2.PdfReader(file)
+                return "".join(page.extract_text() + "\n" for page in reader.pages)
+        except ImportError:
+            return None
+    
     def _parse_xlsx(self, path: Path) -> Dict:
         """Parse Excel file"""
         try:
             # Try to import Excel parser
             try:
                 import openpyxl
-                workbook = openpyxl.load_workbook(path)
+                # Read-only mode streams cells lazily instead of building the
+                # full styled workbook; data_only yields cached formula values
+                workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
                 
-                content = ""
+                lines = []
                 structured_data = {}
                 
-                for sheet_name in workbook.sheetnames:
-                    sheet = workbook[sheet_name]
-                    content += f"\n=== {sheet_name} ===\n"
-                    
-                    sheet_data = []
-                    for row in sheet.iter_rows(values_only=True):
-                        if any(cell is not None for cell in row):
-                            row_str = " | ".join(str(cell) if cell is not None else "" for cell in row)
-                            content += row_str + "\n"
-                            sheet_data.append(row)
-                    
-                    structured_data[sheet_name] = sheet_data
+                try:
+                    for sheet_name in workbook.sheetnames:
+                        sheet = workbook[sheet_name]
+                        lines.append(f"\n=== {sheet_name} ===\n")
+                        
+                        sheet_data = []
+                        for row in sheet.iter_rows(values_only=True):
+                            if any(cell is not None for cell in row):
+                                row_str = " | ".join("" if cell is None else str(cell) for cell in row)
+                                lines.append(row_str + "\n")
+                                if self.keep_structured:
+                                    sheet_data.append(row)
+                        
+                        if self.keep_structured:
+                            structured_data[sheet_name] = sheet_data
+                finally:
+                    workbook.close()  # Read-only workbooks hold the file open
+                
+                content = "".join(lines)
                 
             except ImportError:
                 content = f"[Excel: {path.name}] - openpyxl not installed. Install with: pip install openpyxl"
                 structured_data = {}
             
+            scan = content[:self.max_scan_chars]
             return {
                 'file_name': path.name,
                 'file_type': 'excel',
-                'content': content,
+                'content': scan,
+                'total_chars': len(content),
                 'structured_data': structured_data,
-                'costs': self._extract_costs(content)
+                'costs': self._extract_costs(scan)
             }
         except Exception as e:
             return {
@@ -188,27 +395,27 @@ class FileParser:
                 import docx
                 doc = docx.Document(path)
                 
-                content = ""
-                for paragraph in doc.paragraphs:
-                    content += paragraph.text + "\n"
+                # Word pads layout with empty paragraphs - skip them
+                lines = [text + "\n" for text in (p.text for p in doc.paragraphs) if text and not text.isspace()]
                 
-                # Also extract tables
+                # Also extract tables (skipping rows with no cell text)
                 for table in doc.tables:
-                    content += "\n[Table]\n"
+                    lines.append("\n[Table]\n")
                     for row in table.rows:
-                        row_text = " | ".join(cell.text for cell in row.cells)
-                        content += row_text + "\n"
+                        cells = [cell.text for cell in row.cells]
+                        if any(text and not text.isspace() for text in cells):
+                            lines.append(" | ".join(cells) + "\n")
+                content = "".join(lines)
             except ImportError:
                 content = f"[Word: {path.name}] - python-docx not installed. Install with: pip install python-docx"
             
+            scan = content[:self.max_scan_chars]
             return {
                 'file_name': path.name,
                 'file_type': 'word',
-                'content': content,
-                'links': self._extract_links(content),
-                'destinations': self._extract_destinations(content),
-                'dates': self._extract_dates(content),
-                'costs': self._extract_costs(content)
+                'content': scan,
+                'total_chars': len(content),
+                **self._extract_all(scan)
             }
         except Exception as e:
             return {
@@ -217,17 +424,17 @@ class FileParser:
                 'content': f"[Word: {path.name}] - Could not parse"
             }
     
-    def _is_google_maps_link(self, content: str) -> bool:
-        """Check if content is a Google Maps link"""
-        return 'google.com/maps' in content.lower() or 'goo.gl/maps' in content.lower()
+    def _is_google_maps_link(self, content_lower: str) -> bool:
+        """Check if (lowercased) content is a Google Maps link"""
+        return 'google.com/maps' in content_lower or 'goo.gl/maps' in content_lower
     
-    def _is_wanderlog_link(self, content: str) -> bool:
-        """Check if content is a Wanderlog link"""
-        return 'wanderlog.com' in content.lower()
+    def _is_wanderlog_link(self, content_lower: str) -> bool:
+        """Check if (lowercased) content is a Wanderlog link"""
+        return 'wanderlog.com' in content_lower
     
     def _parse_google_maps_link(self, content: str, filename: str) -> Dict:
         """Parse Google Maps link"""
-        links = re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', content)
+        links = _URL_RE.findall(content)
         
         return {
             'file_name': filename,
@@ -239,7 +446,7 @@ class FileParser:
     
     def _parse_wanderlog_link(self, content: str, filename: str) -> Dict:
         """Parse Wanderlog link"""
-        links = re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', content)
+        links = _URL_RE.findall(content)
         
         return {
             'file_name': filename,
@@ -249,65 +456,56 @@ class FileParser:
             'note': 'Wanderlog link detected - agent can reference this shared itinerary'
         }
     
+    def _extract_all(self, content: str) -> Dict[str, List[str]]:
+        """
+        Extract links, destinations, dates and costs.
+        
+        Links, dates and costs come from one fused scan; destinations keep
+        their own patterns because they overlap activity phrases like "visit X".
+        """
+        found = {'link': [], 'date': [], 'cost': []}
+        seen = {'date': set(), 'cost': set()}
+        for kind, value in _iter_combined_matches(content):
+            if kind in seen:
+                # Dedup as we go and ignore anything past the cap
+                if value in seen[kind] or len(found[kind]) == _COMBINED_LIMITS[kind]:
+                    continue
+                seen[kind].add(value)
+            found[kind].append(value)
+        return {
+            'links': found['link'],
+            'destinations': self._extract_destinations(content),
+            'dates': found['date'],  # Up to 20 unique dates
+            'costs': found['cost']  # Up to 50 unique costs
+        }
+    
     def _extract_links(self, content: str) -> List[str]:
         """Extract URLs from content"""
-        pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        return re.findall(pattern, content)
+        return _URL_RE.findall(content)
     
     def _extract_destinations(self, content: str) -> List[str]:
         """Extract destination names (simple pattern matching)"""
-        # Look for patterns like "Visit X", "Trip to X", city names in caps
-        destinations = []
-        patterns = [
-            r'(?:visit|trip to|going to|destination:)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s+(?:Japan|France|Italy|UK|USA|Spain|Germany|China)',
-        ]
-        for pattern in patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            destinations.extend(matches)
-        return list(set(destinations))[:10]  # Limit to top 10 unique
+        matches = (m.group(1) for pattern in _DESTINATION_RES for m in pattern.finditer(content))
+        return _capped_unique(matches, 10)  # Limit to top 10 unique
     
     def _extract_dates(self, content: str) -> List[str]:
         """Extract dates (various formats)"""
-        patterns = [
-            r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-            r'\d{2}/\d{2}/\d{4}',  # DD/MM/YYYY or MM/DD/YYYY
-            r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}',  # Month DD, YYYY
-        ]
-        dates = []
-        for pattern in patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            dates.extend(matches)
-        return list(set(dates))[:20]  # Limit to 20 dates
+        matches = (m.group() for pattern in _DATE_RES for m in pattern.finditer(content))
+        return _capped_unique(matches, 20)  # Limit to 20 dates
     
     def _extract_costs(self, content: str) -> List[str]:
         """Extract cost/price information"""
-        patterns = [
-            r'\$\d+(?:,\d{3})*(?:\.\d{2})?',  # $1,234.56
-            r'€\d+(?:,\d{3})*(?:\.\d{2})?',  # €1,234.56
-            r'¥\d+(?:,\d{3})*',  # ¥1,234
-            r'£\d+(?:,\d{3})*(?:\.\d{2})?',  # £1,234.56
-        ]
-        costs = []
-        for pattern in patterns:
-            matches = re.findall(pattern, content)
-            costs.extend(matches)
-        return list(set(costs))[:50]  # Limit to 50 costs
+        matches = (m.group() for pattern in _COST_RES for m in pattern.finditer(content))
+        return _capped_unique(matches, 50)  # Limit to 50 costs
     
     def _extract_activities(self, content: str) -> List[str]:
         """Extract activity mentions"""
-        # Look for common activity keywords
-        activity_keywords = [
-            'visit', 'see', 'tour', 'explore', 'hike', 'museum', 'temple', 
-            'shrine', 'restaurant', 'cafe', 'shopping', 'market', 'park',
-            'beach', 'mountain', 'castle', 'garden'
-        ]
-        activities = []
-        for keyword in activity_keywords:
-            pattern = rf'{keyword}\s+([a-zA-Z\s]+?)(?:\.|,|\n|$)'
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            activities.extend([f"{keyword.title()} {match.strip()}" for match in matches if len(match.strip()) > 3])
-        return list(set(activities))[:30]  # Limit to 30 activities
+        activities = (
+            f"{match.group('kw').title()} {what}"
+            for match in _ACTIVITY_RE.finditer(content)
+            if len(what := match.group('what').strip()) > 3
+        )
+        return _capped_unique(activities, 30)  # Limit to 30 activities
 
 
 def parse_reference_files(file_paths: List[str]) -> List[Dict]:
@@ -320,14 +518,13 @@ def parse_reference_files(file_paths: List[str]) -> List[Dict]:
     Returns:
         List of parsed file data dictionaries
     """
-    parser = FileParser()
-    results = []
-    
-    for file_path in file_paths:
-        result = parser.parse_file(file_path)
-        results.append(result)
+    parser = FileParser()  # Stateless, safe to share across threads
+    if len(file_paths) <= 1:
+        return [parser.parse_file(file_path) for file_path in file_paths]
     
-    return results
+    # PDF/Excel/Word parsing is mostly file I/O and native code - overlap it
+    with ThreadPoolExecutor(max_workers=min(8, len(file_paths))) as executor:
+        return list(executor.map(parser.parse_file, file_paths))
 
 
 def create_reference_context(parsed_files: List[Dict]) -> str:
@@ -343,14 +540,14 @@ def create_reference_context(parsed_files: List[Dict]) -> str:
     if not parsed_files:
         return ""
     
-    context = "=== REFERENCE FILES FROM FRIENDS' TRIPS ===\n\n"
+    parts = ["=== REFERENCE FILES FROM FRIENDS' TRIPS ===\n\n"]
     
     for i, file_data in enumerate(parsed_files, 1):
-        context += f"Reference {i}: {file_data.get('file_name', 'Unknown')}\n"
-        context += f"Type: {file_data.get('file_type', 'unknown')}\n"
+        parts.append(f"Reference {i}: {file_data.get('file_name', 'Unknown')}\n")
+        parts.append(f"Type: {file_data.get('file_type', 'unknown')}\n")
         
         if 'error' in file_data:
-            context += f"Note: {file_data['error']}\n\n"
+            parts.append(f"Note: {file_data['error']}\n\n")
             continue
         
         # Add content summary
@@ -358,31 +555,32 @@ def create_reference_context(parsed_files: List[Dict]) -> str:
         if content:
             # Truncate if too long
             max_length = 2000
-            if len(content) > max_length:
-                content = content[:max_length] + f"\n... (truncated, {len(content)} total chars)"
-            context += f"Content:\n{content}\n"
+            total_chars = file_data.get('total_chars', len(content))
+            if total_chars > max_length:
+                content = content[:max_length] + f"\n... (truncated, {total_chars} total chars)"
+            parts.append(f"Content:\n{content}\n")
         
         # Add extracted information
         if file_data.get('destinations'):
-            context += f"Destinations mentioned: {', '.join(file_data['destinations'])}\n"
+            parts.append(f"Destinations mentioned: {', '.join(file_data['destinations'])}\n")
         
         if file_data.get('dates'):
-            context += f"Dates found: {', '.join(file_data['dates'][:5])}\n"
+            parts.append(f"Dates found: {', '.join(file_data['dates'][:5])}\n")
         
         if file_data.get('costs'):
-            context += f"Costs mentioned: {', '.join(file_data['costs'][:10])}\n"
+            parts.append(f"Costs mentioned: {', '.join(file_data['costs'][:10])}\n")
         
         if file_data.get('activities'):
-            context += f"Activities: {', '.join(file_data['activities'][:10])}\n"
+            parts.append(f"Activities: {', '.join(file_data['activities'][:10])}\n")
         
         if file_data.get('links'):
-            context += f"Links: {', '.join(file_data['links'][:5])}\n"
+            parts.append(f"Links: {', '.join(file_data['links'][:5])}\n")
         
         if file_data.get('note'):
-            context += f"Note: {file_data['note']}\n"
+            parts.append(f"Note: {file_data['note']}\n")
         
-        context += "\n" + "─" * 60 + "\n\n"
+        parts.append("\n" + "─" * 60 + "\n\n")
     
-    context += "=== END OF REFERENCE FILES ===\n"
-    return context
+    parts.append("=== END OF REFERENCE FILES ===\n")
+    return "".join(parts)
 
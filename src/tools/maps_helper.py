@@ -3,14 +3,22 @@ Google Maps URL generator for trip planning.
 Generates searchable and direction links without needing an API key.
 """
 
+from functools import lru_cache
 from typing import List, Optional
-import urllib.parse
+from urllib.parse import quote
+
+# URL prefixes/templates built once; only the quoted parts vary per call.
+# Itineraries link the same places/legs repeatedly, so the single-URL
+# builders are memoized (arguments are plain strings).
+_SEARCH_URL = "https://www.google.com/maps/search/?api=1&query="
+_DIRECTIONS_URL = "https://www.google.com/maps/dir/?api=1&origin={}&destination={}&travelmode={}".format
 
 
 class MapsHelper:
     """Helper for generating Google Maps URLs"""
     
     @staticmethod
+    @lru_cache(maxsize=512)
     def search_url(query: str, location: Optional[str] = None) -> str:
         """
         Generate a Google Maps search URL.
@@ -27,10 +35,10 @@ class MapsHelper:
         else:
             full_query = query
             
-        encoded_query = urllib.parse.quote(full_query)
-        return f"https://www.google.com/maps/search/?api=1&query={encoded_query}"
+        return _SEARCH_URL + quote(full_query)
     
     @staticmethod
+    @lru_cache(maxsize=512)
     def directions_url(
         origin: str,
         destination: str,
@@ -47,15 +55,7 @@ class MapsHelper:
         Returns:
             Google Maps directions URL
         """
-        encoded_origin = urllib.parse.quote(origin)
-        encoded_dest = urllib.parse.quote(destination)
-        
-        return (
-            f"https://www.google.com/maps/dir/?api=1"
-            f"&origin={encoded_origin}"
-            f"&destination={encoded_dest}"
-            f"&travelmode={mode}"
-        )
+        return _DIRECTIONS_URL(quote(origin), quote(destination), mode)
     
     @staticmethod
     def place_url(place_name: str, location: str) -> str:
@@ -83,9 +83,7 @@ class MapsHelper:
         Returns:
             Google Maps search URL
         """
-        query = f"{area_name}, {city}"
-        encoded = urllib.parse.quote(query)
-        return f"https://www.google.com/maps/search/?api=1&query={encoded}"
+        return _SEARCH_URL + quote(f"{area_name}, {city}")
     
     @staticmethod
     def create_maps_context(
@@ -104,21 +102,15 @@ class MapsHelper:
         Returns:
             Dictionary with maps links
         """
-        context = {
-            "destination_overview": MapsHelper.area_url(destination, destination),
-            "attractions": {},
-            "restaurants": {}
-        }
+        # Same location suffix for every place (search_url skips it when empty);
+        # locals keep the comprehensions off global lookups and method calls
+        suffix = f", {destination}" if destination else ""
+        prefix = _SEARCH_URL
+        q = quote
         
-        for attraction in attractions:
-            context["attractions"][attraction] = MapsHelper.search_url(
-                attraction, destination
-            )
-        
-        for restaurant in restaurants:
-            context["restaurants"][restaurant] = MapsHelper.search_url(
-                restaurant, destination
-            )
-        
-        return context
+        return {
+            "destination_overview": prefix + q(f"{destination}, {destination}"),
+            "attractions": {attraction: prefix + q(attraction + suffix) for attraction in attractions},
+            "restaurants": {restaurant: prefix + q(restaurant + suffix) for restaurant in restaurants}
+        }
 
@@ -3,11 +3,114 @@ Real-time weather API integration with fallback to model knowledge.
 Uses OpenWeatherMap API when available, falls back gracefully when not.
 """
 
+import asyncio
+import copy
+import logging
+import math
+from bisect import bisect_right
+from collections import Counter
+import re
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import date, datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from src.config import Config
 from src.tools.weather_tool import WeatherTool
+from src.tools.weather_cache import PersistentTTLCache
+
+# Optional: C-accelerated parsing of the ~30-50 KB forecast payload
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional: non-blocking HTTP for concurrent multi-destination lookups
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+
+def _parse_json(response) -> Any:
+    """Decode a requests/httpx response body, with orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# The free 5-day/3-hour forecast has at most 40 slots (8 per day)
+_SLOTS_PER_DAY = 8
+_MAX_FORECAST_SLOTS = 5 * _SLOTS_PER_DAY
+
+
+def _forecast_slots(end_date) -> int:
+    """
+    3-hour slots ('cnt') needed from now through the end of the trip.
+    
+    OpenWeather counts cnt from the current time, not the trip start, so
+    this covers now..end_date, rounded up to whole days to share cache entries.
+    """
+    if isinstance(end_date, str):
+        end_date = date.fromisoformat(end_date)
+    trip_end = datetime.combine(end_date + timedelta(days=1), datetime.min.time()).timestamp()
+    slots = math.ceil((trip_end - time.time()) / 10800)
+    days = max(1, -(-slots // _SLOTS_PER_DAY))
+    return min(_MAX_FORECAST_SLOTS, days * _SLOTS_PER_DAY)
+
+
+def _build_session() -> requests.Session:
+    """Pooled keep-alive session so geocode + forecast (and later calls) reuse one connection."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": "argonauts/1.0"})
+    return session
+
+
+# Shared by every WeatherAPI instance (each research agent creates its own)
+_session = _build_session()
+
+logger = logging.getLogger("argonauts")
+
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+# Guards every WeatherAPI cache below (agents may run research concurrently)
+_cache_lock = threading.Lock()
+
+
+def _ttl_get(cache: Dict, key, ttl: float):
+    """Return a cached value younger than ttl seconds, or None on miss/expiry."""
+    with _cache_lock:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        fetched_at, value = entry
+        if time.monotonic() - fetched_at >= ttl:
+            del cache[key]
+            return None
+        return value
+
+
+def _ttl_put(cache: Dict, key, value, ttl: float, max_entries: int) -> None:
+    """Store a value with its fetch time, evicting the oldest entry when full."""
+    if ttl <= 0:
+        return
+    with _cache_lock:
+        cache.pop(key, None)
+        if len(cache) >= max_entries:
+            # Dicts keep insertion order - evict the oldest fetch
+            del cache[next(iter(cache))]
+        cache[key] = (time.monotonic(), value)
 
 
 class WeatherAPI:
@@ -20,6 +123,31 @@ class WeatherAPI:
     
     BASE_URL = "http://api.openweathermap.org/data/2.5"
     
+    GEO_URL = "http://api.openweathermap.org/geo/1.0/direct"
+    
+    # Process-wide caches, each entry is (fetched_at, value):
+    # processed result per (destination, start, end) ...
+    CACHE_TTL_SECONDS = Config.WEATHER_CACHE_TTL
+    CACHE_MAX_ENTRIES = 512
+    _cache: Dict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]] = {}
+    # ... and raw forecast payload per rounded (lat, lon), refreshed more often.
+    # Entries are {"ts", "ttl", "etag", "last_modified", "body"}; stale ones are
+    # kept so the next fetch can revalidate them with a conditional request
+    FORECAST_TTL_SECONDS = Config.WEATHER_FORECAST_TTL
+    FORECAST_MAX_ENTRIES = 256
+    _forecast_cache: Dict[Tuple[float, float], Dict[str, Any]] = {}
+    
+    # (event loop, result cache key) -> future of the fetch currently in progress
+    _in_flight: Dict[Tuple[asyncio.AbstractEventLoop, Tuple[str, str, str]], "asyncio.Future"] = {}
+    
+    # City -> (lat, lon) never changes: no TTL
+    _geocode_cache: Dict[str, Tuple[float, float]] = {}
+    
+    # Second tier behind the geocode and forecast dicts, shared across CLI runs
+    _disk: Optional[PersistentTTLCache] = (
+        PersistentTTLCache(Config.WEATHER_CACHE_DB) if Config.WEATHER_CACHE_DB else None
+    )
+    
     def __init__(self):
         self.api_key = Config.OPENWEATHER_API_KEY
         self.fallback = WeatherTool()
@@ -51,61 +179,354 @@ class WeatherAPI:
             result["note"] = "Using seasonal patterns from training data. For real-time weather, add OPENWEATHER_API_KEY to .env"
             return result
         
+        # Re-planning the same trip shouldn't repeat the geocode + forecast round-trips
+        cache_key = (destination.lower().strip(), str(start_date), str(end_date))
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # Try to get real-time forecast
             weather_data = self._fetch_forecast(destination, start_date, end_date)
             weather_data["source"] = "OpenWeatherMap API (Real-time)"
+            self._cache_put(cache_key, weather_data)
             return weather_data
         
         except Exception as e:
-            # API failed, use fallback
-            print(f"⚠️  Weather API error: {e}. Using AI knowledge fallback.")
-            result = self.fallback.get_weather(destination, start_date, end_date)
-            result["source"] = "AI Knowledge (API error)"
-            result["note"] = f"Weather API unavailable. Using seasonal patterns."
-            return result
+            return self._api_error_fallback(destination, start_date, end_date, e)
     
-    def _fetch_forecast(
+    async def get_weather_async(
         self,
         destination: str,
         start_date: date,
-        end_date: date
+        end_date: date,
+        client: Optional["httpx.AsyncClient"] = None
     ) -> Dict[str, Any]:
         """
-        Fetch weather forecast from OpenWeatherMap API.
+        Async variant of get_weather (same caching and fallbacks).
         
-        Uses the 5-day/3-hour forecast API (free tier).
+        Args:
+            destination: Destination city
+            start_date: Trip start date
+            end_date: Trip end date
+            client: Shared httpx client (a temporary one is opened if omitted)
+            
+        Returns:
+            Weather information dictionary with source indicator
         """
-        # Get coordinates first (geocoding)
-        geo_url = f"http://api.openweathermap.org/geo/1.0/direct"
-        geo_params = {
-            "q": destination,
-            "limit": 1,
-            "appid": self.api_key
-        }
+        if not self.has_api:
+            return self.get_weather(destination, start_date, end_date)
         
-        geo_response = requests.get(geo_url, params=geo_params, timeout=10)
-        geo_response.raise_for_status()
-        geo_data = geo_response.json()
+        cache_key = (destination.lower().strip(), str(start_date), str(end_date))
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Single-flight: concurrent callers on this loop share one in-progress fetch
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, cache_key)
+        pending = self._in_flight.get(flight_key)
+        if pending is not None:
+            try:
+                return copy.deepcopy(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # This caller was cancelled, not the shared fetch
+                # The fetching caller was cancelled - fetch ourselves below
+        
+        future = loop.create_future()
+        self._in_flight[flight_key] = future
+        try:
+            weather_data = await self._fetch_weather_async(cache_key, destination, start_date, end_date, client)
+            # Waiters get their own copies, so the caller may mutate weather_data freely
+            future.set_result(copy.deepcopy(weather_data))
+            return weather_data
+        finally:
+            if not future.done():
+                future.cancel()
+            if self._in_flight.get(flight_key) is future:
+                del self._in_flight[flight_key]
+    
+    async def _fetch_weather_async(
+        self,
+        cache_key: Tuple[str, str, str],
+        destination: str,
+        start_date: date,
+        end_date: date,
+        client: Optional["httpx.AsyncClient"]
+    ) -> Dict[str, Any]:
+        """Cache-miss path of get_weather_async (API result or seasonal fallback)."""
+        if not HTTPX_AVAILABLE:
+            # Blocking requests path, moved off the event loop
+            return await asyncio.to_thread(self.get_weather, destination, start_date, end_date)
+        
+        try:
+            if client is None:
+                async with httpx.AsyncClient(timeout=10) as own_client:
+                    weather_data = await self._fetch_forecast_async(own_client, destination, start_date, end_date)
+            else:
+                weather_data = await self._fetch_forecast_async(client, destination, start_date, end_date)
+            weather_data["source"] = "OpenWeatherMap API (Real-time)"
+            self._cache_put(cache_key, weather_data)
+            return weather_data
         
+        except Exception as e:
+            return self._api_error_fallback(destination, start_date, end_date, e)
+    
+    async def get_weather_batch(
+        self,
+        destinations: List[Tuple[str, date, date]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch weather for several (destination, start_date, end_date) legs concurrently.
+        
+        Total latency is roughly that of the slowest leg instead of the sum;
+        one pooled client is shared by all requests in the batch.
+        
+        Args:
+            destinations: Trip legs, e.g. one per city of a multi-city itinerary
+            
+        Returns:
+            Weather dictionaries in the same order as destinations
+        """
+        if not (self.has_api and HTTPX_AVAILABLE):
+            return list(await asyncio.gather(*(self.get_weather_async(*leg) for leg in destinations)))
+        async with httpx.AsyncClient(timeout=10) as client:
+            return list(await asyncio.gather(
+                *(self.get_weather_async(*leg, client=client) for leg in destinations)
+            ))
+    
+    def _api_error_fallback(
+        self,
+        destination: str,
+        start_date: date,
+        end_date: date,
+        error: Exception
+    ) -> Dict[str, Any]:
+        """Seasonal-knowledge result used when the API call fails."""
+        logger.warning("⚠️  Weather API error: %s. Using AI knowledge fallback.", error)
+        result = self.fallback.get_weather(destination, start_date, end_date)
+        result["source"] = "AI Knowledge (API error)"
+        result["note"] = f"Weather API unavailable. Using seasonal patterns."
+        return result
+    
+    @classmethod
+    def _cache_get(cls, key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+        """Return a copy of a fresh cached result, or None on miss/expiry."""
+        result = _ttl_get(cls._cache, key, cls.CACHE_TTL_SECONDS)
+        # Deep copy so callers can't mutate the cached daily_forecast/recommendations
+        return copy.deepcopy(result) if result is not None else None
+    
+    @classmethod
+    def _cache_put(cls, key: Tuple[str, str, str], result: Dict[str, Any]) -> None:
+        """Store a successful API result (fallbacks are cheap and not cached)."""
+        _ttl_put(cls._cache, key, copy.deepcopy(result), cls.CACHE_TTL_SECONDS, cls.CACHE_MAX_ENTRIES)
+    
+    def _cached_coords(self, key: str) -> Optional[Tuple[float, float]]:
+        """Coordinates for a normalized city name, if already geocoded (this run or a previous one)."""
+        with _cache_lock:
+            coords = self._geocode_cache.get(key)
+        if coords is None and self._disk is not None:
+            stored = self._disk.get(f"geo:{key}")
+            if stored is not None:
+                coords = (stored[0], stored[1])
+                with _cache_lock:
+                    self._geocode_cache[key] = coords
+        return coords
+    
+    def _store_coords(self, key: str, destination: str, geo_data: List[Dict]) -> Tuple[float, float]:
+        """Extract and remember (lat, lon) from a geocoding response."""
         if not geo_data:
             raise ValueError(f"Location not found: {destination}")
         
-        lat = geo_data[0]["lat"]
-        lon = geo_data[0]["lon"]
-        
-        # Get forecast
-        forecast_url = f"{self.BASE_URL}/forecast"
-        forecast_params = {
+        coords = (geo_data[0]["lat"], geo_data[0]["lon"])
+        with _cache_lock:
+            self._geocode_cache[key] = coords
+        if self._disk is not None:
+            self._disk.set(f"geo:{key}", list(coords))
+        return coords
+    
+    def _geo_params(self, destination: str) -> Dict[str, Any]:
+        """Query parameters for the geocoding endpoint."""
+        return {
+            "q": destination,
+            "limit": 1,
+            "appid": self.api_key
+        }
+    
+    def _forecast_params(self, lat: float, lon: float, slots: int) -> Dict[str, Any]:
+        """Query parameters for the forecast endpoint."""
+        return {
             "lat": lat,
             "lon": lon,
+            "cnt": slots,  # Only the 3-hour slots the trip can use
+            "lang": "en",
             "appid": self.api_key,
             "units": "metric"  # Celsius
         }
+    
+    def _geocode(self, destination: str) -> Tuple[float, float]:
+        """Resolve a city name to (lat, lon), hitting the geocoding API once per city."""
+        key = destination.lower().strip()
+        coords = self._cached_coords(key)
+        if coords is not None:
+            return coords
+        
+        geo_response = _session.get(self.GEO_URL, params=self._geo_params(destination), timeout=10)
+        geo_response.raise_for_status()
+        return self._store_coords(key, destination, _parse_json(geo_response))
+    
+    def _lookup_forecast(
+        self,
+        lat: float,
+        lon: float,
+        slots: int
+    ) -> Tuple[Tuple[float, float, int], Optional[Dict[str, Any]], bool]:
+        """
+        Find a cached forecast covering `slots` slots near (lat, lon).
+        
+        Any fresh payload with at least as many slots will do; otherwise the
+        (possibly stale) exact entry is returned for conditional revalidation.
         
-        forecast_response = requests.get(forecast_url, params=forecast_params, timeout=10)
-        forecast_response.raise_for_status()
-        forecast_data = forecast_response.json()
+        Returns:
+            (cache key to store under, entry or None, whether entry is fresh)
+        """
+        # Rounding collapses coordinates for the same place to one entry
+        lat, lon = round(lat, 3), round(lon, 3)
+        for wider in range(slots, _MAX_FORECAST_SLOTS + 1, _SLOTS_PER_DAY):
+            entry, fresh = self._forecast_entry((lat, lon, wider))
+            if fresh:
+                return (lat, lon, slots), entry, True
+        key = (lat, lon, slots)
+        entry, _ = self._forecast_entry(key)
+        return key, entry, False
+    
+    def _forecast_entry(self, key: Tuple[float, float, int]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Return (cached entry or None, whether it is still fresh)."""
+        with _cache_lock:
+            entry = self._forecast_cache.get(key)
+        if entry is None and self._disk is not None:
+            stored = self._disk.get_entry(f"forecast:{key[0]},{key[1]},{key[2]}")
+            if stored is not None:
+                # Rebase the wall-clock expiry onto this process's monotonic clock
+                entry, expires = stored
+                entry["ts"] = time.monotonic()
+                entry["ttl"] = max(0.0, expires - time.time())
+                with _cache_lock:
+                    self._forecast_cache.setdefault(key, entry)
+        if entry is None:
+            return None, False
+        return entry, time.monotonic() - entry["ts"] < entry["ttl"]
+    
+    @staticmethod
+    def _conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for revalidating a stale entry."""
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+    
+    def _store_forecast(self, key: Tuple[float, float], entry: Optional[Dict[str, Any]], response) -> Dict[str, Any]:
+        """
+        Resolve a (requests or httpx) forecast response against the cache.
+        
+        A 304 just renews the cached entry (no body to download or parse);
+        otherwise the new body and its validators replace it. The entry TTL
+        follows Cache-Control max-age when the server sends one.
+        """
+        headers = response.headers
+        match = _MAX_AGE_RE.search(headers.get("Cache-Control", ""))
+        ttl = int(match.group(1)) if match else self.FORECAST_TTL_SECONDS
+        
+        if response.status_code == 304 and entry is not None:
+            body = entry["body"]
+        else:
+            response.raise_for_status()
+            body = _parse_json(response)
+        
+        new_entry = {
+            "ts": time.monotonic(),
+            "ttl": ttl,
+            "etag": headers.get("ETag") or (entry or {}).get("etag"),
+            "last_modified": headers.get("Last-Modified") or (entry or {}).get("last_modified"),
+            "body": body,  # Shared read-only: _process_forecast never mutates it
+        }
+        if self.FORECAST_TTL_SECONDS > 0:
+            with _cache_lock:
+                self._forecast_cache.pop(key, None)
+                if len(self._forecast_cache) >= self.FORECAST_MAX_ENTRIES:
+                    del self._forecast_cache[next(iter(self._forecast_cache))]
+                self._forecast_cache[key] = new_entry
+            if self._disk is not None:
+                # Kept past its TTL on disk too, so a later run can still revalidate it
+                self._disk.set(
+                    f"forecast:{key[0]},{key[1]},{key[2]}",
+                    {name: new_entry[name] for name in ("etag", "last_modified", "body")},
+                    ttl
+                )
+        return body
+    
+    def _fetch_raw_forecast(self, lat: float, lon: float, slots: int = _MAX_FORECAST_SLOTS) -> Dict[str, Any]:
+        """Fetch the 5-day/3-hour forecast payload, cached per ~100 m grid cell and slot count."""
+        key, entry, fresh = self._lookup_forecast(lat, lon, slots)
+        if fresh:
+            return entry["body"]
+        
+        forecast_response = _session.get(
+            f"{self.BASE_URL}/forecast",
+            params=self._forecast_params(lat, lon, slots),
+            headers=self._conditional_headers(entry),
+            timeout=10
+        )
+        return self._store_forecast(key, entry, forecast_response)
+    
+    async def _fetch_forecast_async(
+        self,
+        client: "httpx.AsyncClient",
+        destination: str,
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, Any]:
+        """Async _fetch_forecast over httpx, sharing the same caches."""
+        key = destination.lower().strip()
+        coords = self._cached_coords(key)
+        if coords is None:
+            geo_response = await client.get(self.GEO_URL, params=self._geo_params(destination))
+            geo_response.raise_for_status()
+            coords = self._store_coords(key, destination, _parse_json(geo_response))
+        lat, lon = coords
+        
+        slots = _forecast_slots(end_date)
+        forecast_key, entry, fresh = self._lookup_forecast(lat, lon, slots)
+        if fresh:
+            forecast_data = entry["body"]
+        else:
+            forecast_response = await client.get(
+                f"{self.BASE_URL}/forecast",
+                params=self._forecast_params(lat, lon, slots),
+                headers=self._conditional_headers(entry)
+            )
+            forecast_data = self._store_forecast(forecast_key, entry, forecast_response)
+        
+        return self._process_forecast(forecast_data, destination, start_date, end_date)
+    
+    def _fetch_forecast(
+        self,
+        destination: str,
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, Any]:
+        """
+        Fetch weather forecast from OpenWeatherMap API.
+        
+        Uses the 5-day/3-hour forecast API (free tier).
+        """
+        # Coordinates are cached indefinitely, the forecast per coordinate briefly
+        lat, lon = self._geocode(destination)
+        forecast_data = self._fetch_raw_forecast(lat, lon, _forecast_slots(end_date))
         
         # Process forecast for date range
         return self._process_forecast(
@@ -136,57 +557,69 @@ class WeatherAPI:
             except ValueError:
                 raise
         
-        forecasts_by_date = {}
+        # Local-midnight timestamps bounding each trip day (day i is bounds[i] <= dt < bounds[i+1]),
+        # so items are bucketed by comparing raw epoch ints instead of building a datetime each
+        first_day = start_date.toordinal()
+        midnight = datetime.min.time()
+        bounds = [
+            datetime.combine(date.fromordinal(day), midnight).timestamp()
+            for day in range(first_day, end_date.toordinal() + 2)
+        ]
+        range_start, range_end = (bounds[0], bounds[-1]) if len(bounds) > 1 else (0, 0)
         
-        for item in forecast_data.get("list", []):
-            dt = datetime.fromtimestamp(item["dt"]).date()
+        # One pass over the 3-hourly items, aggregating per day as we go:
+        # day offset -> [temp_sum, count, temp_min, temp_max, max_rain_pct, condition counts]
+        daily: Dict[int, list] = {}
+        for item in forecast_data.get("list", ()):
+            ts = item["dt"]
             
             # Only include dates in our range
-            if start_date <= dt <= end_date:
-                if dt not in forecasts_by_date:
-                    forecasts_by_date[dt] = []
-                
-                forecasts_by_date[dt].append({
-                    "temp": item["main"]["temp"],
-                    "feels_like": item["main"]["feels_like"],
-                    "temp_min": item["main"]["temp_min"],
-                    "temp_max": item["main"]["temp_max"],
-                    "humidity": item["main"]["humidity"],
-                    "weather": item["weather"][0]["description"],
-                    "rain_probability": item.get("pop", 0) * 100,  # Probability of precipitation
-                    "wind_speed": item["wind"]["speed"]
-                })
-        
-        # Calculate daily summaries
-        daily_summaries = []
-        for dt, forecasts in sorted(forecasts_by_date.items()):
-            if not forecasts:  # Skip if no forecast data for this date
+            if ts < range_start or ts >= range_end:
                 continue
+            dt = bisect_right(bounds, ts) - 1
             
-            temps = [f["temp"] for f in forecasts]
-            avg_temp = sum(temps) / len(temps) if temps else 0
-            min_temp = min(f["temp_min"] for f in forecasts) if forecasts else 0
-            max_temp = max(f["temp_max"] for f in forecasts) if forecasts else 0
-            rain_prob = max(f["rain_probability"] for f in forecasts) if forecasts else 0
-            
-            # Most common weather condition
-            conditions = [f["weather"] for f in forecasts]
-            main_condition = max(set(conditions), key=conditions.count)
+            main = item["main"]
+            rain = item.get("pop", 0) * 100  # Probability of precipitation
+            condition = item["weather"][0]["description"]
+            day = daily.get(dt)
+            if day is None:
+                daily[dt] = [main["temp"], 1, main["temp_min"], main["temp_max"], rain, Counter((condition,))]
+                continue
+            day[0] += main["temp"]
+            day[1] += 1
+            if main["temp_min"] < day[2]:
+                day[2] = main["temp_min"]
+            if main["temp_max"] > day[3]:
+                day[3] = main["temp_max"]
+            if rain > day[4]:
+                day[4] = rain
+            day[5][condition] += 1
+        
+        # Calculate daily summaries; numbers stay numeric (rounded as displayed)
+        # for the recommendations and are only formatted into the output strings
+        daily_summaries = []
+        avg_temps = []
+        rain_probs = []
+        for dt, (temp_sum, count, min_temp, max_temp, rain_prob, conditions) in sorted(daily.items()):
+            avg_temp = round(temp_sum / count, 1)
+            rain_prob = round(rain_prob)
+            avg_temps.append(avg_temp)
+            rain_probs.append(rain_prob)
             
             daily_summaries.append({
-                "date": dt.strftime("%Y-%m-%d"),
+                "date": date.fromordinal(first_day + dt).isoformat(),
                 "avg_temp": f"{avg_temp:.1f}°C",
                 "temp_range": f"{min_temp:.1f}°C - {max_temp:.1f}°C",
-                "conditions": main_condition,
-                "rain_probability": f"{rain_prob:.0f}%"
+                # Most common weather condition
+                "conditions": conditions.most_common(1)[0][0],
+                "rain_probability": f"{rain_prob}%"
             })
         
         # Generate recommendations
-        recommendations = self._generate_recommendations(daily_summaries)
+        recommendations = self._generate_recommendations(avg_temps, rain_probs)
         
         # Calculate average for summary
-        all_temps = [float(d["avg_temp"].replace("°C", "")) for d in daily_summaries]
-        avg_temp_overall = sum(all_temps) / len(all_temps) if all_temps and len(all_temps) > 0 else 0
+        avg_temp_overall = sum(avg_temps) / len(avg_temps) if avg_temps else 0
         
         return {
             "destination": destination,
@@ -197,18 +630,17 @@ class WeatherAPI:
             "recommendations": recommendations
         }
     
-    def _generate_recommendations(self, daily_summaries: list) -> list:
-        """Generate packing and planning recommendations from forecast."""
+    def _generate_recommendations(self, avg_temps: List[float], rain_probs: List[int]) -> list:
+        """Generate packing and planning recommendations from daily average temps and rain %."""
         recommendations = []
         
         # Check if we have any data
-        if not daily_summaries or len(daily_summaries) == 0:
+        if not avg_temps:
             recommendations.append("Check local forecast closer to travel date")
             return recommendations
         
         # Temperature-based
-        temps = [float(d["avg_temp"].replace("°C", "")) for d in daily_summaries]
-        avg_temp = sum(temps) / len(temps) if temps else 15  # Default to mild temp
+        avg_temp = sum(avg_temps) / len(avg_temps)
         
         if avg_temp < 10:
             recommendations.append("Pack warm layers, jacket, and gloves")
@@ -218,10 +650,7 @@ class WeatherAPI:
             recommendations.append("Light, breathable clothing recommended")
         
         # Rain-based
-        max_rain = max(
-            float(d["rain_probability"].replace("%", "")) 
-            for d in daily_summaries
-        )
+        max_rain = max(rain_probs)
         
         if max_rain > 50:
             recommendations.append("High chance of rain - bring umbrella and waterproof jacket")
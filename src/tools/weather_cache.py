@@ -0,0 +1,112 @@
+"""
+Disk-persisted TTL cache for weather lookups.
+
+The planner runs as a short-lived CLI, so in-memory caches are lost
+between runs. This keeps geocodes and forecasts in a small SQLite file
+(~/.cache/argonauts/weather.sqlite by default) so re-planning a trip
+skips the API entirely.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+# Expired rows are kept this long for ETag revalidation, then pruned. A
+# 5-day forecast more than a day past expiry has moved on anyway
+STALE_RETENTION_SECONDS = 86400
+
+
+class PersistentTTLCache:
+    """
+    SQLite-backed key/value cache with per-entry expiry.
+
+    Values are JSON-serializable objects stored zlib-compressed.
+    Any database error degrades to a cache miss - the cache is an
+    optimization only. Entries that expired more than stale_retention
+    seconds ago are deleted when the database is opened, so the file
+    stays bounded across runs.
+    """
+
+    def __init__(self, path: str, stale_retention: float = STALE_RETENTION_SECONDS):
+        self.path = Path(path).expanduser()
+        self.stale_retention = stale_retention
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._disabled = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database on first use (caller holds the lock)."""
+        if self._conn is None and not self._disabled:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache "
+                    "(key TEXT PRIMARY KEY, ts REAL, expires REAL, body BLOB)"
+                )
+                conn.execute(
+                    "DELETE FROM cache WHERE expires < ?",  # NULL (never expires) is kept
+                    (time.time() - self.stale_retention,)
+                )
+                self._conn = conn
+            except (OSError, sqlite3.Error):
+                # Read-only home, locked file etc. - run without persistence
+                self._disabled = True
+        return self._conn
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """
+        Look up a key regardless of expiry.
+
+        Returns:
+            (value, expires) where expires is a Unix timestamp or None for
+            entries that never expire; None on miss
+        """
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute("SELECT expires, body FROM cache WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                return None
+        if row is None:
+            return None
+        expires, body = row
+        try:
+            return json.loads(zlib.decompress(body)), expires
+        except (zlib.error, ValueError):
+            return None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self.get_entry(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and expires <= time.time():
+            return None
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value for ttl seconds (None = never expires)."""
+        now = time.time()
+        expires = now + ttl if ttl is not None else None
+        body = zlib.compress(json.dumps(value).encode("utf-8"))
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, ts, expires, body) VALUES (?, ?, ?, ?)",
+                    (key, now, expires, body)
+                )
+            except sqlite3.Error:
+                pass
@@ -3,12 +3,131 @@ Weather information tool for trip planning.
 Provides seasonal information and weather forecasts.
 """
 
-from typing import Dict
+from typing import Dict, Optional
 from datetime import date
+from functools import lru_cache
+from types import MappingProxyType
 import requests
 from src.config import Config
 
 
+def _read_only(mapping: dict) -> MappingProxyType:
+    """Recursively wrap nested dicts in read-only proxies (module constants are shared)"""
+    return MappingProxyType({
+        key: _read_only(value) if isinstance(value, dict) else value
+        for key, value in mapping.items()
+    })
+
+
+# Seasonal data for common destinations (fallback knowledge base)
+_SEASONAL_DATA = _read_only({
+    "tokyo": {
+        1: {"temp": "5-10°C", "conditions": "Cold, clear skies", "season": "Winter"},
+        2: {"temp": "5-12°C", "conditions": "Cold, occasional snow", "season": "Winter"},
+        3: {"temp": "10-15°C", "conditions": "Mild, cherry blossom season begins", "season": "Spring"},
+        4: {"temp": "14-20°C", "conditions": "Pleasant spring weather, cherry blossoms", "season": "Spring"},
+        5: {"temp": "18-24°C", "conditions": "Warm, occasional rain", "season": "Spring/Summer"},
+        6: {"temp": "21-27°C", "conditions": "Humid, rainy season begins", "season": "Summer"},
+        7: {"temp": "25-31°C", "conditions": "Hot and humid", "season": "Summer"},
+        8: {"temp": "26-31°C", "conditions": "Very hot and humid", "season": "Summer"},
+        9: {"temp": "22-27°C", "conditions": "Warm, typhoon season", "season": "Fall"},
+        10: {"temp": "17-22°C", "conditions": "Pleasant, clear skies", "season": "Fall"},
+        11: {"temp": "12-17°C", "conditions": "Cool, fall foliage", "season": "Fall"},
+        12: {"temp": "7-12°C", "conditions": "Cold, dry", "season": "Winter"},
+    },
+    "kyoto": {
+        3: {"temp": "8-14°C", "conditions": "Mild, cherry blossom season", "season": "Spring"},
+        4: {"temp": "13-20°C", "conditions": "Pleasant, peak cherry blossoms", "season": "Spring"},
+        11: {"temp": "10-17°C", "conditions": "Cool, stunning fall foliage", "season": "Fall"},
+    },
+    "osaka": {
+        3: {"temp": "9-15°C", "conditions": "Mild spring weather", "season": "Spring"},
+        4: {"temp": "14-21°C", "conditions": "Pleasant, cherry blossoms", "season": "Spring"},
+    }
+})
+
+# Generic fallback per season, indexed by month via _MONTH_TO_SEASON
+_GENERIC_SEASONS = _read_only({
+    "Winter": {"temp": "Variable", "conditions": "Winter", "season": "Winter"},
+    "Spring": {"temp": "Variable", "conditions": "Spring", "season": "Spring"},
+    "Summer": {"temp": "Variable", "conditions": "Summer", "season": "Summer"},
+    "Fall": {"temp": "Variable", "conditions": "Fall/Autumn", "season": "Fall"},
+})
+_MONTH_TO_SEASON = (
+    None, "Winter", "Winter", "Spring", "Spring", "Spring", "Summer",
+    "Summer", "Summer", "Fall", "Fall", "Fall", "Winter"
+)
+
+# Recommendation templates used by get_weather
+_COLD_RECS = (
+    "Pack warm layers and a winter jacket",
+    "Bring gloves and scarf for cold weather",
+    "Indoor attractions are popular - book ahead"
+)
+_HOT_RECS = (
+    "Light, breathable clothing recommended",
+    "Sunscreen and hat essential",
+    "Stay hydrated in hot weather",
+    "Consider indoor activities during peak heat"
+)
+_CHERRY_BLOSSOM_RECS = (
+    "Cherry blossom season - book accommodations early",
+    "Popular hanami spots will be crowded",
+    "Perfect time for outdoor photography"
+)
+_GENERAL_RECS = (
+    "Check weather forecast closer to departure",
+    "Comfortable walking shoes essential for sightseeing"
+)
+
+
+@lru_cache(maxsize=256)
+def _seasonal_city(destination: str) -> Optional[str]:
+    """
+    Resolve a destination to its _SEASONAL_DATA city, normalizing once per distinct name.
+    
+    Known cities map to themselves; anything else in Japan uses Tokyo's data.
+    """
+    dest_lower = destination.lower()
+    if dest_lower in _SEASONAL_DATA:
+        return dest_lower
+    if "japan" in dest_lower:
+        return "tokyo"
+    return None
+
+
+# Destinations that get cherry-blossom tips in March/April
+_CHERRY_BLOSSOM_DESTINATIONS = frozenset(("tokyo", "kyoto", "japan"))
+
+
+@lru_cache(maxsize=256)
+def _seasonal_recommendations(dest_lower: str, month: int, temp_lower: str, conditions_lower: str) -> tuple:
+    """Top 6 packing/planning recommendations for a season (few distinct inputs, so cached)"""
+    recommendations = []
+    
+    # Temperature-based recommendations
+    if "cold" in temp_lower or "cold" in conditions_lower or month in (12, 1, 2):
+        recommendations.extend(_COLD_RECS)
+    elif "hot" in temp_lower or "hot" in conditions_lower:
+        recommendations.extend(_HOT_RECS)
+    else:
+        recommendations.append("Comfortable layers recommended for varying temperatures")
+    
+    # Condition-based recommendations
+    if "rain" in conditions_lower or month in (6, 7):
+        recommendations.append("Pack umbrella - rainy season")
+    
+    if "cherry blossom" in conditions_lower or (dest_lower in _CHERRY_BLOSSOM_DESTINATIONS and month in (3, 4)):
+        recommendations.extend(_CHERRY_BLOSSOM_RECS)
+    
+    if "fall foliage" in conditions_lower or "autumn" in conditions_lower:
+        recommendations.append("Beautiful fall colors - great for photography")
+    
+    # General recommendations
+    recommendations.extend(_GENERAL_RECS)
+    return tuple(recommendations[:6])  # Top 6 recommendations
+
+
 class WeatherTool:
     """Tool for fetching weather information"""
     
@@ -25,55 +144,14 @@ class WeatherTool:
         Get seasonal information for a destination.
         This is a knowledge-based fallback when API is not available.
         """
-        
-        # Seasonal data for common destinations (fallback knowledge base)
-        seasonal_data = {
-            "tokyo": {
-                1: {"temp": "5-10°C", "conditions": "Cold, clear skies", "season": "Winter"},
-                2: {"temp": "5-12°C", "conditions": "Cold, occasional snow", "season": "Winter"},
-                3: {"temp": "10-15°C", "conditions": "Mild, cherry blossom season begins", "season": "Spring"},
-                4: {"temp": "14-20°C", "conditions": "Pleasant spring weather, cherry blossoms", "season": "Spring"},
-                5: {"temp": "18-24°C", "conditions": "Warm, occasional rain", "season": "Spring/Summer"},
-                6: {"temp": "21-27°C", "conditions": "Humid, rainy season begins", "season": "Summer"},
-                7: {"temp": "25-31°C", "conditions": "Hot and humid", "season": "Summer"},
-                8: {"temp": "26-31°C", "conditions": "Very hot and humid", "season": "Summer"},
-                9: {"temp": "22-27°C", "conditions": "Warm, typhoon season", "season": "Fall"},
-                10: {"temp": "17-22°C", "conditions": "Pleasant, clear skies", "season": "Fall"},
-                11: {"temp": "12-17°C", "conditions": "Cool, fall foliage", "season": "Fall"},
-                12: {"temp": "7-12°C", "conditions": "Cold, dry", "season": "Winter"},
-            },
-            "kyoto": {
-                3: {"temp": "8-14°C", "conditions": "Mild, cherry blossom season", "season": "Spring"},
-                4: {"temp": "13-20°C", "conditions": "Pleasant, peak cherry blossoms", "season": "Spring"},
-                11: {"temp": "10-17°C", "conditions": "Cool, stunning fall foliage", "season": "Fall"},
-            },
-            "osaka": {
-                3: {"temp": "9-15°C", "conditions": "Mild spring weather", "season": "Spring"},
-                4: {"temp": "14-21°C", "conditions": "Pleasant, cherry blossoms", "season": "Spring"},
-            }
-        }
-        
-        dest_lower = destination.lower()
-        
-        # Try to find specific data
-        if dest_lower in seasonal_data and month in seasonal_data[dest_lower]:
-            return seasonal_data[dest_lower][month]
-        
-        # Try Tokyo as default for Japan
-        if "japan" in dest_lower and month in seasonal_data["tokyo"]:
-            return seasonal_data["tokyo"][month]
+        # Tables are module-level constants - return copies so callers can't mutate them
+        city = _seasonal_city(destination)
+        if city is not None and month in _SEASONAL_DATA[city]:
+            return dict(_SEASONAL_DATA[city][month])
         
         # Generic fallback
-        seasons = {
-            (12, 1, 2): {"temp": "Variable", "conditions": "Winter", "season": "Winter"},
-            (3, 4, 5): {"temp": "Variable", "conditions": "Spring", "season": "Spring"},
-            (6, 7, 8): {"temp": "Variable", "conditions": "Summer", "season": "Summer"},
-            (9, 10, 11): {"temp": "Variable", "conditions": "Fall/Autumn", "season": "Fall"},
-        }
-        
-        for months, info in seasons.items():
-            if month in months:
-                return info
+        if 1 <= month <= 12:
+            return dict(_GENERIC_SEASONS[_MONTH_TO_SEASON[month]])
         
         return {"temp": "Variable", "conditions": "Check local forecast", "season": "Unknown"}
     
@@ -117,46 +195,13 @@ class WeatherTool:
         month = start_date.month
         seasonal_info = self.get_seasonal_info(destination, month)
         
-        # Generate recommendations based on season and destination
-        recommendations = []
-        
-        temp_lower = seasonal_info.get("temp", "").lower()
-        conditions_lower = seasonal_info.get("conditions", "").lower()
-        
-        # Temperature-based recommendations
-        if "cold" in temp_lower or "cold" in conditions_lower or month in [12, 1, 2]:
-            recommendations.extend([
-                "Pack warm layers and a winter jacket",
-                "Bring gloves and scarf for cold weather",
-                "Indoor attractions are popular - book ahead"
-            ])
-        elif "hot" in temp_lower or "hot" in conditions_lower:
-            recommendations.extend([
-                "Light, breathable clothing recommended",
-                "Sunscreen and hat essential",
-                "Stay hydrated in hot weather",
-                "Consider indoor activities during peak heat"
-            ])
-        else:
-            recommendations.append("Comfortable layers recommended for varying temperatures")
-        
-        # Condition-based recommendations
-        if "rain" in conditions_lower or month in [6, 7]:
-            recommendations.append("Pack umbrella - rainy season")
-        
-        if "cherry blossom" in conditions_lower or (destination.lower() in ["tokyo", "kyoto", "japan"] and month in [3, 4]):
-            recommendations.extend([
-                "Cherry blossom season - book accommodations early",
-                "Popular hanami spots will be crowded",
-                "Perfect time for outdoor photography"
-            ])
-        
-        if "fall foliage" in conditions_lower or "autumn" in conditions_lower:
-            recommendations.append("Beautiful fall colors - great for photography")
-        
-        # General recommendations
-        recommendations.append("Check weather forecast closer to departure")
-        recommendations.append("Comfortable walking shoes essential for sightseeing")
+        # Recommendations depend only on these four strings/ints - memoized per combination
+        recommendations = list(_seasonal_recommendations(
+            destination.lower(),
+            month,
+            seasonal_info.get("temp", "").lower(),
+            seasonal_info.get("conditions", "").lower()
+        ))
         
         return {
             "destination": destination,
@@ -164,7 +209,7 @@ class WeatherTool:
             "average_temp_celsius": seasonal_info.get("temp", "Variable"),
             "conditions": seasonal_info.get("conditions", "Seasonal"),
             "season": seasonal_info.get("season", ""),
-            "recommendations": recommendations[:6]  # Top 6 recommendations
+            "recommendations": recommendations
         }
     
     def get_tool_spec(self) -> Dict:
@@ -1,6 +1,23 @@
 """Utility modules for Trip Planner Agent"""
 
-from .model_helper import create_gemini_model, default_model
+import importlib
 
-__all__ = ['create_gemini_model', 'default_model']
+# model_helper pulls in the ADK/genai stack, so its exports are resolved on
+# first attribute access (PEP 562) - importing a light submodule such as
+# src.utils.prefilter no longer pays for it.
+_LAZY_EXPORTS = {
+    'create_gemini_model': ('.model_helper', 'create_gemini_model'),
+    'default_model': ('.model_helper', 'default_model'),
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module_name, attr = _LAZY_EXPORTS[name]
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+        globals()[name] = value  # Cache so __getattr__ runs once per name
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
+
+__all__ = ['create_gemini_model', 'default_model']
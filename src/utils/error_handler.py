@@ -6,10 +6,17 @@ Provides graceful error handling and user-friendly messages.
 from rich.console import Console
 from functools import wraps
 import asyncio
+import logging
+import traceback
 from typing import Callable, Any
+from src.config import Config
 
 console = Console()
 
+# Stack traces are only formatted when this logger is at DEBUG (LOG_LEVEL=DEBUG)
+logger = logging.getLogger("argonauts")
+logger.setLevel(getattr(logging, Config.LOG_LEVEL.upper(), logging.INFO))
+
 
 class TripPlannerError(Exception):
     """Base exception for trip planner errors"""
@@ -31,6 +38,42 @@ class AgentError(TripPlannerError):
     pass
 
 
+# Known error types: (headline, follow-up hint, swallow the error and return None?)
+_ERROR_HANDLERS = (
+    (InvalidInputError, "[bold red]❌ Input Error:[/bold red]",
+     "[yellow]Please check your input YAML file.[/yellow]", False),
+    # Don't re-raise - let fallback handle it
+    (APIError, "[bold yellow]⚠️  API Error:[/bold yellow]",
+     "[dim]Falling back to alternative methods...[/dim]", True),
+    (AgentError, "[bold red]❌ Agent Error:[/bold red]",
+     "[yellow]The agent encountered an issue. Please try again.[/yellow]", False),
+)
+
+
+def _report_error(error: Exception) -> bool:
+    """
+    Print a user-friendly message for an error raised inside @handle_errors.
+    
+    Returns:
+        True if the error should be swallowed (wrapper returns None),
+        False if it should be re-raised
+    """
+    for error_type, headline, hint, swallow in _ERROR_HANDLERS:
+        if isinstance(error, error_type):
+            console.print(f"{headline} {error}")
+            console.print(hint)
+            return swallow
+    
+    console.print(f"[bold red]❌ Unexpected Error:[/bold red] {error}")
+    # Walk and format the stack only when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        console.print("[dim]Stack trace for debugging:[/dim]")
+        console.print(f"[dim]{traceback.format_exc()}[/dim]")
+    else:
+        console.print("[dim]Set LOG_LEVEL=DEBUG for the stack trace.[/dim]")
+    return False
+
+
 def handle_errors(func: Callable) -> Callable:
     """
     Decorator for graceful error handling in agent methods.
@@ -45,48 +88,32 @@ def handle_errors(func: Callable) -> Callable:
         async def async_wrapper(*args, **kwargs):
             try:
                 return await func(*args, **kwargs)
-            except InvalidInputError as e:
-                console.print(f"[bold red]❌ Input Error:[/bold red] {e}")
-                console.print("[yellow]Please check your input YAML file.[/yellow]")
-                raise
-            except APIError as e:
-                console.print(f"[bold yellow]⚠️  API Error:[/bold yellow] {e}")
-                console.print("[dim]Falling back to alternative methods...[/dim]")
-                # Don't re-raise - let fallback handle it
-                return None
-            except AgentError as e:
-                console.print(f"[bold red]❌ Agent Error:[/bold red] {e}")
-                console.print("[yellow]The agent encountered an issue. Please try again.[/yellow]")
-                raise
             except Exception as e:
-                console.print(f"[bold red]❌ Unexpected Error:[/bold red] {e}")
-                console.print("[dim]Stack trace for debugging:[/dim]")
-                import traceback
-                console.print(f"[dim]{traceback.format_exc()}[/dim]")
-                raise
+                if not _report_error(e):
+                    raise
+                return None
         return async_wrapper
     else:
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
-            except InvalidInputError as e:
-                console.print(f"[bold red]❌ Input Error:[/bold red] {e}")
-                console.print("[yellow]Please check your input YAML file.[/yellow]")
-                raise
-            except APIError as e:
-                console.print(f"[bold yellow]⚠️  API Error:[/bold yellow] {e}")
-                console.print("[dim]Falling back to alternative methods...[/dim]")
-                return None
             except Exception as e:
-                console.print(f"[bold red]❌ Unexpected Error:[/bold red] {e}")
-                console.print("[dim]Stack trace:[/dim]")
-                import traceback
-                console.print(f"[dim]{traceback.format_exc()}[/dim]")
-                raise
+                if not _report_error(e):
+                    raise
+                return None
         return sync_wrapper
 
 
+# Allowed preference values (messages keep the documented order)
+_BUDGET_LEVELS = ("budget", "mid-range", "luxury")
+_VALID_BUDGETS = frozenset(_BUDGET_LEVELS)
+_VALID_BUDGETS_MSG = ", ".join(_BUDGET_LEVELS)
+_PACES = ("relaxed", "moderate", "fast")
+_VALID_PACES = frozenset(_PACES)
+_VALID_PACES_MSG = ", ".join(_PACES)
+
+
 def validate_trip_input(trip_input: Any) -> None:
     """
     Validate trip input has required fields.
@@ -111,14 +138,12 @@ def validate_trip_input(trip_input: Any) -> None:
         raise InvalidInputError("Trip duration cannot exceed 365 days (really? that's not a trip, that's relocating!)")
     
     # Validate budget level
-    valid_budgets = ["budget", "mid-range", "luxury"]
-    if trip_input.preferences.budget_level not in valid_budgets:
-        raise InvalidInputError(f"Budget level must be one of: {', '.join(valid_budgets)}")
+    if trip_input.preferences.budget_level not in _VALID_BUDGETS:
+        raise InvalidInputError(f"Budget level must be one of: {_VALID_BUDGETS_MSG}")
     
     # Validate pace
-    valid_paces = ["relaxed", "moderate", "fast"]
-    if trip_input.preferences.pace_preference not in valid_paces:
-        raise InvalidInputError(f"Pace must be one of: {', '.join(valid_paces)}")
+    if trip_input.preferences.pace_preference not in _VALID_PACES:
+        raise InvalidInputError(f"Pace must be one of: {_VALID_PACES_MSG}")
 
 
 def safe_file_parse(file_path: str, parser_func: Callable) -> Any:
@@ -2,6 +2,7 @@
 Model Helper - Creates properly configured Gemini models with retry logic.
 """
 
+from functools import lru_cache
 from google.adk.models.google_llm import Gemini
 from google.genai import types
 from src.config import Config
@@ -36,6 +37,18 @@ def create_gemini_model(
     retry_exp_base = retry_exp_base or Config.RETRY_EXP_BASE
     retry_initial_delay = retry_initial_delay or Config.RETRY_INITIAL_DELAY
     
+    return _cached_gemini_model(model_name, temperature, retry_attempts, retry_exp_base, retry_initial_delay)
+
+
+@lru_cache(maxsize=16)
+def _cached_gemini_model(
+    model_name: str,
+    temperature: float,
+    retry_attempts: int,
+    retry_exp_base: int,
+    retry_initial_delay: int
+) -> Gemini:
+    """Build one Gemini client per distinct (resolved) configuration; agents share it"""
     # Create retry configuration
     retry_config = types.HttpRetryOptions(
         attempts=retry_attempts,
@@ -52,6 +65,10 @@ def create_gemini_model(
     )
 
 
-# Pre-configured model for easy import
-default_model = create_gemini_model()
+def __getattr__(name):
+    # Pre-configured model for easy import, built on first access (PEP 562)
+    # rather than as an import side effect
+    if name == "default_model":
+        return create_gemini_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
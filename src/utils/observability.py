@@ -6,16 +6,164 @@ Provides detailed logging, metrics tracking, and performance monitoring.
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import time
+import gzip
 import json
+import logging
+import os
+import shutil
 from pathlib import Path
+from src.config import Config
+
+# Optional: C-accelerated JSON for the metrics dump
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 console = Console()
 
+# Console icons, shared with the ADK observability plugin
+_STATUS_EMOJI = {"started": "▶️", "completed": "✅", "failed": "❌"}
+_TOOL_TYPE_ICONS = {
+    "built-in": "🔧",
+    "custom": "⚙️",
+    "mcp": "🔌",
+    "file": "📁",
+    "api": "🌐"
+}
+
+# Metrics files are written off the caller's thread; workers are joined at exit
+_METRICS_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metrics-writer")
+
+logger = logging.getLogger("argonauts")
+
+# Metrics files newer than this belong to the current run and are never rotated
+_PROCESS_START = time.time()
+
+
+def _serialize_metrics(metrics: Dict[str, Any]) -> bytes:
+    """Snapshot metrics as JSON bytes (on the caller, while the dict can't change)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(metrics, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(metrics, indent=2).encode("utf-8")
+
+
+def _write_metrics(log_file: Path, data: bytes):
+    """Hand the serialized metrics to a single write, then rotate old files"""
+    log_file.write_bytes(data)
+    _rotate_metrics(log_file)
+
+
+def _log_write_failure(log_file: Path, future):
+    """Report a background metrics write that raised (nobody else awaits it)"""
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Could not write metrics to %s: %s", log_file, exc)
+
+
+def _submit_metrics(log_file: Path, metrics: Dict[str, Any]) -> Future:
+    """Serialize now, write in the background"""
+    future = _METRICS_WRITER.submit(_write_metrics, log_file, _serialize_metrics(metrics))
+    future.add_done_callback(lambda f: _log_write_failure(log_file, f))
+    return future
+
+
+def _rotate_metrics(latest: Path):
+    """
+    Keep the logs directory bounded.
+    
+    Metrics from earlier runs are gzipped (~10x smaller for this JSON) and
+    compressed files older than METRICS_RETENTION_DAYS are deleted.
+    Files written since this process started are left alone - the tracker
+    and the ADK plugin both write here during one run - and an existing
+    archive is never overwritten. Best effort - a failure here never
+    affects the run.
+    """
+    log_dir = latest.parent
+    try:
+        for old_file in log_dir.glob("metrics_*.json"):
+            if old_file == latest:
+                continue
+            mtime = old_file.stat().st_mtime
+            archive = Path(f"{old_file}.gz")
+            if mtime >= _PROCESS_START or archive.exists():
+                continue
+            with old_file.open("rb") as src, gzip.open(archive, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            # Age the archive from the run that produced it
+            os.utime(archive, (mtime, mtime))
+            old_file.unlink()
+        
+        if Config.METRICS_RETENTION_DAYS > 0:
+            cutoff = time.time() - Config.METRICS_RETENTION_DAYS * 86400
+            for archived in log_dir.glob("metrics_*.json.gz"):
+                if archived.stat().st_mtime < cutoff:
+                    archived.unlink()
+    except OSError:
+        pass
+
+
+# (millisecond, isoformat) of the last timestamp handed out
+_iso_cache = (0, "")
+
+
+def _now_iso() -> str:
+    """
+    Current local time as an ISO string, formatted at most once per millisecond.
+    
+    Log calls arrive in bursts within the same event loop tick; reusing the
+    formatted string avoids a datetime.now().isoformat() per entry.
+    """
+    global _iso_cache
+    ms = time.time_ns() // 1_000_000
+    cached_ms, cached_iso = _iso_cache
+    if ms != cached_ms:
+        cached_iso = datetime.now().isoformat()
+        _iso_cache = (ms, cached_iso)
+    return cached_iso
+
+
+class _ConsoleBuffer:
+    """
+    Batches progress lines into a single console write.
+    
+    Lines are flushed at agent boundaries, before errors/warnings and
+    summaries, or once FLUSH_LINES accumulate. In quiet mode progress
+    lines are dropped entirely. Dim detail lines (per-tool events, agent
+    summaries) are only formatted for an interactive terminal or at
+    LOG_LEVEL=DEBUG - piped/CI output keeps the headline lines.
+    """
+    
+    FLUSH_LINES = 32
+    
+    def _init_console_buffer(self):
+        self.quiet = Config.OBSERVABILITY_QUIET
+        debug = getattr(logging, Config.LOG_LEVEL.upper(), logging.INFO) <= logging.DEBUG
+        self.verbose = not self.quiet and (console.is_terminal or debug)
+        self._console_buf: List[str] = []
+    
+    def _emit(self, line: str):
+        """Queue a progress line for display"""
+        if self.quiet:
+            return
+        self._console_buf.append(line)
+        if len(self._console_buf) >= self.FLUSH_LINES:
+            self._flush_console()
+    
+    def _flush_console(self):
+        """Write all queued progress lines in one call"""
+        if self._console_buf:
+            console.print("\n".join(self._console_buf))
+            self._console_buf.clear()
 
-class ObservabilityTracker:
+
+class ObservabilityTracker(_ConsoleBuffer):
     """
     Tracks agent execution metrics for observability and debugging.
     """
@@ -36,15 +184,16 @@ class ObservabilityTracker:
             "performance": {}
         }
         self.timers = {}
+        self._init_console_buffer()
     
     def start_timer(self, name: str):
         """Start timing an operation"""
-        self.timers[name] = time.time()
+        self.timers[name] = time.perf_counter()
     
     def end_timer(self, name: str) -> float:
         """End timing and return duration"""
         if name in self.timers:
-            duration = time.time() - self.timers[name]
+            duration = time.perf_counter() - self.timers[name]
             self.metrics["performance"][name] = f"{duration:.2f}s"
             return duration
         return 0.0
@@ -62,7 +211,7 @@ class ObservabilityTracker:
         entry = {
             "agent": agent_name,
             "status": status,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
         if duration:
             entry["duration"] = f"{duration:.2f}s"
@@ -76,12 +225,13 @@ class ObservabilityTracker:
         self.metrics["agents_executed"].append(entry)
         
         # Display
-        status_emoji = {"started": "▶️", "completed": "✅", "failed": "❌"}.get(status, "ℹ️")
+        status_emoji = _STATUS_EMOJI.get(status, "ℹ️")
         duration_str = f" ({duration:.2f}s)" if duration else ""
         iteration_str = f" [iteration {iteration}]" if iteration else ""
-        console.print(f"[cyan]{status_emoji} {agent_name}: {status}{duration_str}{iteration_str}[/cyan]")
-        if summary and status == "completed":
-            console.print(f"[dim]  → {summary}[/dim]")
+        self._emit(f"[cyan]{status_emoji} {agent_name}: {status}{duration_str}{iteration_str}[/cyan]")
+        if self.verbose and summary and status == "completed":
+            self._emit(f"[dim]  → {summary}[/dim]")
+        self._flush_console()  # Agent boundary
     
     def log_tool_call(
         self, 
@@ -94,7 +244,7 @@ class ObservabilityTracker:
         entry = {
             "tool": tool_name,
             "status": status,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "type": tool_type or "unknown"
         }
         if details:
@@ -103,59 +253,55 @@ class ObservabilityTracker:
         self.metrics["tool_calls"].append(entry)
         
         # Display
-        type_icon = {
-            "built-in": "🔧",
-            "custom": "⚙️",
-            "mcp": "🔌",
-            "file": "📁",
-            "api": "🌐"
-        }.get(tool_type, "🔧")
-        
         if status == "success":
-            console.print(f"  [dim]{type_icon} {tool_name}: ✅ ({tool_type})[/dim]")
+            if self.verbose:
+                self._emit(f"  [dim]{_TOOL_TYPE_ICONS.get(tool_type, '🔧')} {tool_name}: ✅ ({tool_type})[/dim]")
         elif status == "failed":
-            console.print(f"  [yellow]{type_icon} {tool_name}: ⚠️  {details}[/yellow]")
+            self._emit(f"  [yellow]{_TOOL_TYPE_ICONS.get(tool_type, '🔧')} {tool_name}: ⚠️  {details}[/yellow]")
     
     def log_error(self, error: str, context: Optional[str] = None):
         """Log an error"""
         entry = {
             "error": error,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
         if context:
             entry["context"] = context
         
         self.metrics["errors"].append(entry)
+        self._flush_console()
         console.print(f"[red]❌ Error: {error}[/red]")
     
     def log_warning(self, warning: str, context: Optional[str] = None):
         """Log a warning"""
         entry = {
             "warning": warning,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
         if context:
             entry["context"] = context
         
         self.metrics["warnings"].append(entry)
+        self._flush_console()
         console.print(f"[yellow]⚠️  {warning}[/yellow]")
     
     def display_summary(self):
         """Display execution summary"""
+        self._flush_console()
         table = Table(title="🔍 Execution Metrics", show_header=True)
         table.add_column("Metric", style="cyan")
         table.add_column("Value", style="green")
         
-        # Count unique agents (not individual executions)
-        unique_agents = set()
-        for entry in self.metrics["agents_executed"]:
-            if entry["status"] == "completed":
-                unique_agents.add(entry["agent"])
+        # Completed executions per agent, in one pass
+        completed = Counter(
+            entry["agent"] for entry in self.metrics["agents_executed"]
+            if entry["status"] == "completed"
+        )
         
         # Add metrics
         table.add_row("Session ID", self.session_id[:16] + "...")
-        table.add_row("Unique Agents", str(len(unique_agents)))
-        table.add_row("Total Executions", str(len([e for e in self.metrics["agents_executed"] if e["status"] == "completed"])))
+        table.add_row("Unique Agents", str(len(completed)))
+        table.add_row("Total Executions", str(sum(completed.values())))
         table.add_row("Tool Calls", str(len(self.metrics["tool_calls"])))
         table.add_row("Errors", str(len(self.metrics["errors"])))
         table.add_row("Warnings", str(len(self.metrics["warnings"])))
@@ -169,6 +315,7 @@ class ObservabilityTracker:
     
     def save_metrics(self, output_dir: str = "logs"):
         """Save metrics to file"""
+        self._flush_console()
         log_dir = Path(output_dir)
         log_dir.mkdir(parents=True, exist_ok=True)
         
@@ -177,16 +324,16 @@ class ObservabilityTracker:
         
         self.metrics["end_time"] = datetime.now().isoformat()
         
-        with open(log_file, 'w') as f:
-            json.dump(self.metrics, f, indent=2)
+        _submit_metrics(log_file, self.metrics)
         
-        console.print(f"\n[green]📊 Metrics saved to: {log_file}[/green]")
+        console.print(f"\n[green]📊 Writing metrics to: {log_file}[/green]")
 
 
 class PerformanceMonitor:
     """Monitor performance of agent executions"""
     
     def __init__(self):
+        # Timings are kept as running [count, total] pairs - constant memory per name
         self.metrics = {
             "agent_timings": {},
             "tool_timings": {},
@@ -196,29 +343,27 @@ class PerformanceMonitor:
     
     def record_agent_time(self, agent_name: str, duration: float):
         """Record agent execution time"""
-        if agent_name not in self.metrics["agent_timings"]:
-            self.metrics["agent_timings"][agent_name] = []
-        self.metrics["agent_timings"][agent_name].append(duration)
+        timing = self.metrics["agent_timings"].setdefault(agent_name, [0, 0.0])
+        timing[0] += 1
+        timing[1] += duration
     
     def record_tool_time(self, tool_name: str, duration: float):
         """Record tool execution time"""
-        if tool_name not in self.metrics["tool_timings"]:
-            self.metrics["tool_timings"][tool_name] = []
-        self.metrics["tool_timings"][tool_name].append(duration)
+        timing = self.metrics["tool_timings"].setdefault(tool_name, [0, 0.0])
+        timing[0] += 1
+        timing[1] += duration
     
     def get_summary(self) -> Dict[str, Any]:
         """Get performance summary"""
         summary = {}
         
         # Average agent times
-        for agent, times in self.metrics["agent_timings"].items():
-            avg = sum(times) / len(times)
-            summary[f"{agent}_avg"] = f"{avg:.2f}s"
+        for agent, (count, total) in self.metrics["agent_timings"].items():
+            summary[f"{agent}_avg"] = f"{total / count:.2f}s"
         
         # Average tool times
-        for tool, times in self.metrics["tool_timings"].items():
-            avg = sum(times) / len(times)
-            summary[f"{tool}_avg"] = f"{avg:.2f}s"
+        for tool, (count, total) in self.metrics["tool_timings"].items():
+            summary[f"{tool}_avg"] = f"{total / count:.2f}s"
         
         return summary
     
@@ -228,15 +373,13 @@ class PerformanceMonitor:
         
         if self.metrics["agent_timings"]:
             console.print("[cyan]Agent Execution Times:[/cyan]")
-            for agent, times in self.metrics["agent_timings"].items():
-                avg = sum(times) / len(times)
-                console.print(f"  • {agent}: {avg:.2f}s (avg of {len(times)} runs)")
+            for agent, (count, total) in self.metrics["agent_timings"].items():
+                console.print(f"  • {agent}: {total / count:.2f}s (avg of {count} runs)")
         
         if self.metrics["tool_timings"]:
             console.print("\n[cyan]Tool Execution Times:[/cyan]")
-            for tool, times in self.metrics["tool_timings"].items():
-                avg = sum(times) / len(times)
-                console.print(f"  • {tool}: {avg:.2f}s (avg of {len(times)} calls)")
+            for tool, (count, total) in self.metrics["tool_timings"].items():
+                console.print(f"  • {tool}: {total / count:.2f}s (avg of {count} calls)")
 
 
 # Global tracker instance
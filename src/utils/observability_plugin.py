@@ -11,11 +11,11 @@ Implements comprehensive tracking via plugin callbacks:
 This provides automatic, comprehensive observability without manual logging.
 """
 
-import json
 import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 
 from google.adk.plugins.base_plugin import BasePlugin
 from google.adk.agents.base_agent import BaseAgent
@@ -26,10 +26,83 @@ from google.adk.tools.tool_context import ToolContext
 from google.adk.tools.base_tool import BaseTool
 from rich.console import Console
 
+from src.utils.observability import (
+    _TOOL_TYPE_ICONS, _ConsoleBuffer, _now_iso, _submit_metrics
+)
+
 console = Console()
 
+_MISSING = object()
+
+# Tool type by name keywords, checked in priority order (first match wins)
+_TOOL_TYPE_KEYWORDS = (
+    ("file", ("file", "parse", "read", "load")),
+    ("api", ("weather", "api", "http", "request")),
+    ("built-in", ("google_search", "search", "code_execution", "execute")),
+    ("custom", ("maps", "transport", "export")),
+    ("mcp", ("mcp",)),
+)
+
+
+def _file_details(tool_args: Any) -> str:
+    if isinstance(tool_args, dict):
+        if "file_path" in tool_args:
+            return f"Parsing file: {tool_args['file_path']}"
+        elif "files" in tool_args:
+            return f"Parsing {len(tool_args['files'])} file(s)"
+    return "Parsing reference files"
+
+
+def _weather_details(tool_args: Any) -> str:
+    if isinstance(tool_args, dict):
+        return f"Fetching weather for {tool_args.get('destination', 'unknown')}"
+    return "Fetching weather data"
+
+
+def _search_details(tool_args: Any) -> str:
+    if isinstance(tool_args, dict):
+        return f"Searching: {tool_args.get('query', 'unknown')[:50]}"
+    return "Web search"
+
 
-class ObservabilityPlugin(BasePlugin):
+def _args_details(tool_args: Any) -> str:
+    # Default: show first 50 chars of args
+    return f"Args: {str(tool_args)[:50]}"
+
+
+# Detail formatter by name keyword, checked in priority order
+_TOOL_DETAIL_KEYWORDS = (
+    ("parse", _file_details),
+    ("file", _file_details),
+    ("weather", _weather_details),
+    ("search", _search_details),
+    ("maps", lambda tool_args: "Generating map links"),
+    ("transport", lambda tool_args: "Getting transport info"),
+    ("export", lambda tool_args: "Exporting itinerary"),
+)
+
+
+@lru_cache(maxsize=256)
+def _tool_type(tool_name: str) -> str:
+    """Classify a tool by name (tools are a small closed set, so cached)"""
+    tool_name_lower = tool_name.lower()
+    for tool_type, keywords in _TOOL_TYPE_KEYWORDS:
+        if any(kw in tool_name_lower for kw in keywords):
+            return tool_type
+    return "custom"
+
+
+@lru_cache(maxsize=256)
+def _tool_detail_formatter(tool_name: str) -> Callable[[Any], str]:
+    """Which detail formatter applies to a tool name (resolved once per name)"""
+    tool_name_lower = tool_name.lower()
+    for keyword, formatter in _TOOL_DETAIL_KEYWORDS:
+        if keyword in tool_name_lower:
+            return formatter
+    return _args_details
+
+
+class ObservabilityPlugin(BasePlugin, _ConsoleBuffer):
     """
     ADK Plugin for comprehensive observability tracking.
     
@@ -59,11 +132,13 @@ class ObservabilityPlugin(BasePlugin):
         }
         
         # Tracking state
-        self.agent_start_times = {}
+        self.pending_agents = {}  # (agent name, iteration) -> (perf_counter start, its agents_executed entry)
         self.agent_iteration_count = {}  # Track iterations per agent
-        self.tool_start_times = {}
+        self.pending_tool_calls = {}  # tool name -> stack of (index in tool_calls, perf_counter start)
+        self._init_console_buffer()
         
-        console.print(f"[dim]🔍 Observability plugin initialized for session: {session_id}[/dim]")
+        if self.verbose:
+            self._emit(f"[dim]🔍 Observability plugin initialized for session: {session_id}[/dim]")
     
     # ==================== AGENT CALLBACKS ====================
     
@@ -80,21 +155,22 @@ class ObservabilityPlugin(BasePlugin):
         
         iteration = self.agent_iteration_count[agent_name]
         
-        # Use unique key for each iteration
-        timing_key = f"{agent_name}_iter{iteration}"
-        self.agent_start_times[timing_key] = time.time()
-        
-        # Log start
+        # Log start - completion updates this same record
         entry = {
             "agent": agent_name,
             "status": "started",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
         if iteration > 1:  # Only show iteration if > 1
             entry["iteration"] = iteration
             
         self.metrics["agents_executed"].append(entry)
-        console.print(f"[cyan]▶️  {agent_name}: started{' (iteration ' + str(iteration) + ')' if iteration > 1 else ''}[/cyan]")
+        
+        # Time each iteration separately (monotonic clock)
+        self.pending_agents[(agent_name, iteration)] = (time.perf_counter(), entry)
+        
+        self._emit(f"[cyan]▶️  {agent_name}: started{' (iteration ' + str(iteration) + ')' if iteration > 1 else ''}[/cyan]")
+        self._flush_console()  # Agent boundary
     
     async def after_agent_callback(
         self, *, agent: BaseAgent, callback_context: CallbackContext
@@ -102,26 +178,19 @@ class ObservabilityPlugin(BasePlugin):
         """Track when an agent completes execution."""
         agent_name = agent.name
         iteration = self.agent_iteration_count.get(agent_name, 1)
-        timing_key = f"{agent_name}_iter{iteration}"
+        pending = self.pending_agents.pop((agent_name, iteration), None)
         
-        if timing_key in self.agent_start_times:
-            duration = time.time() - self.agent_start_times[timing_key]
+        if pending is not None:
+            start, entry = pending
+            duration = time.perf_counter() - start
             
             # Generate summary
             summary = self._generate_agent_summary(agent_name, callback_context, iteration)
             
-            # Log completion
-            entry = {
-                "agent": agent_name,
-                "status": "completed",
-                "timestamp": datetime.now().isoformat(),
-                "duration": f"{duration:.2f}s",
-                "summary": summary
-            }
-            if iteration > 1:
-                entry["iteration"] = iteration
-                
-            self.metrics["agents_executed"].append(entry)
+            # Complete the "started" record ("timestamp" stays the start time)
+            entry["status"] = "completed"
+            entry["duration"] = f"{duration:.2f}s"
+            entry["summary"] = summary
             
             # Update performance metrics
             perf_key = agent_name.lower().replace(" ", "_").replace("-", "_")
@@ -129,8 +198,10 @@ class ObservabilityPlugin(BasePlugin):
                 perf_key += f"_iter{iteration}"
             self.metrics["performance"][perf_key] = f"{duration:.2f}s"
             
-            console.print(f"[green]✅ {agent_name}: completed ({duration:.2f}s){' [iteration ' + str(iteration) + ']' if iteration > 1 else ''}[/green]")
-            console.print(f"[dim]   → {summary}[/dim]")
+            self._emit(f"[green]✅ {agent_name}: completed ({duration:.2f}s){' [iteration ' + str(iteration) + ']' if iteration > 1 else ''}[/green]")
+            if self.verbose:
+                self._emit(f"[dim]   → {summary}[/dim]")
+        self._flush_console()  # Agent boundary
     
     # ==================== TOOL CALLBACKS ====================
     
@@ -140,10 +211,6 @@ class ObservabilityPlugin(BasePlugin):
         """Track when a tool is called."""
         tool_name = self._get_tool_name(tool)
         
-        # Start timing
-        timing_key = f"{tool_name}_{datetime.now().timestamp()}"
-        self.tool_start_times[timing_key] = time.time()
-        
         # Classify tool type
         tool_type = self._classify_tool_type(tool_name, tool_args)
         
@@ -155,23 +222,18 @@ class ObservabilityPlugin(BasePlugin):
             "tool": tool_name,
             "type": tool_type,
             "status": "called",
-            "timestamp": datetime.now().isoformat(),
-            "details": details,
-            "_timing_key": timing_key  # Internal use
+            "timestamp": _now_iso(),
+            "details": details
         }
         
+        self.pending_tool_calls.setdefault(tool_name, []).append(
+            (len(self.metrics["tool_calls"]), time.perf_counter())
+        )
         self.metrics["tool_calls"].append(entry)
         
         # Display
-        type_icon = {
-            "file": "📁",
-            "api": "🌐",
-            "built-in": "🔧",
-            "custom": "⚙️",
-            "mcp": "🔌"
-        }.get(tool_type, "🔧")
-        
-        console.print(f"[dim]  {type_icon} {tool_name}: called ({tool_type})[/dim]")
+        if self.verbose:
+            self._emit(f"[dim]  {_TOOL_TYPE_ICONS.get(tool_type, '🔧')} {tool_name}: called ({tool_type})[/dim]")
     
     async def after_tool_callback(
         self, *, tool: BaseTool, tool_args, tool_result, tool_context: ToolContext
@@ -179,23 +241,16 @@ class ObservabilityPlugin(BasePlugin):
         """Track tool completion."""
         tool_name = self._get_tool_name(tool)
         
-        # Update last tool call with success status
-        if self.metrics["tool_calls"]:
-            for tool_call in reversed(self.metrics["tool_calls"]):
-                if tool_call["tool"] == tool_name and tool_call["status"] == "called":
-                    tool_call["status"] = "success"
-                    
-                    # Add timing if available
-                    if "_timing_key" in tool_call:
-                        timing_key = tool_call["_timing_key"]
-                        if timing_key in self.tool_start_times:
-                            duration = time.time() - self.tool_start_times[timing_key]
-                            tool_call["duration"] = f"{duration:.2f}s"
-                            del tool_call["_timing_key"]  # Clean up internal key
-                    
-                    break
+        # Update the most recent pending call of this tool with success status
+        pending = self.pending_tool_calls.get(tool_name)
+        if pending:
+            index, start = pending.pop()
+            tool_call = self.metrics["tool_calls"][index]
+            tool_call["status"] = "success"
+            tool_call["duration"] = f"{time.perf_counter() - start:.2f}s"
         
-        console.print(f"[dim]  ✅ {tool_name}: completed[/dim]")
+        if self.verbose:
+            self._emit(f"[dim]  ✅ {tool_name}: completed[/dim]")
     
     # ==================== MODEL CALLBACKS ====================
     
@@ -220,20 +275,20 @@ class ObservabilityPlugin(BasePlugin):
         self.metrics["errors"].append({
             "error": str(error),
             "context": "LLM call failed",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         })
+        self._flush_console()
         console.print(f"[bold red]❌ Model error: {error}[/bold red]")
     
     # ==================== HELPER METHODS ====================
     
     def _get_tool_name(self, tool: BaseTool) -> str:
         """Get tool name from tool object."""
-        if hasattr(tool, '__name__'):
-            return tool.__name__
-        elif hasattr(tool, 'name'):
-            return tool.name
-        else:
-            return str(tool)
+        # One getattr per attribute (hasattr + access looked each one up twice)
+        name = getattr(tool, '__name__', _MISSING)
+        if name is _MISSING:
+            name = getattr(tool, 'name', _MISSING)
+        return str(tool) if name is _MISSING else name
     
     def _classify_tool_type(self, tool_name: str, tool_args: Any) -> str:
         """
@@ -246,56 +301,11 @@ class ObservabilityPlugin(BasePlugin):
         - custom: Custom tools (maps, transport)
         - mcp: Model Context Protocol tools
         """
-        tool_name_lower = tool_name.lower()
-        
-        if any(kw in tool_name_lower for kw in ["file", "parse", "read", "load"]):
-            return "file"
-        elif any(kw in tool_name_lower for kw in ["weather", "api", "http", "request"]):
-            return "api"
-        elif any(kw in tool_name_lower for kw in ["google_search", "search", "code_execution", "execute"]):
-            return "built-in"
-        elif any(kw in tool_name_lower for kw in ["maps", "transport", "export"]):
-            return "custom"
-        elif "mcp" in tool_name_lower:
-            return "mcp"
-        else:
-            return "custom"
+        return _tool_type(tool_name)
     
     def _extract_tool_details(self, tool_name: str, tool_args: Any) -> str:
         """Extract meaningful details from tool arguments."""
-        tool_name_lower = tool_name.lower()
-        
-        if "parse" in tool_name_lower or "file" in tool_name_lower:
-            if isinstance(tool_args, dict):
-                if "file_path" in tool_args:
-                    return f"Parsing file: {tool_args['file_path']}"
-                elif "files" in tool_args:
-                    return f"Parsing {len(tool_args['files'])} file(s)"
-            return "Parsing reference files"
-            
-        elif "weather" in tool_name_lower:
-            if isinstance(tool_args, dict):
-                dest = tool_args.get("destination", "unknown")
-                return f"Fetching weather for {dest}"
-            return "Fetching weather data"
-            
-        elif "search" in tool_name_lower:
-            if isinstance(tool_args, dict):
-                query = tool_args.get("query", "unknown")
-                return f"Searching: {query[:50]}"
-            return "Web search"
-            
-        elif "maps" in tool_name_lower:
-            return "Generating map links"
-            
-        elif "transport" in tool_name_lower:
-            return "Getting transport info"
-            
-        elif "export" in tool_name_lower:
-            return "Exporting itinerary"
-        
-        # Default: show first 50 chars of args
-        return f"Args: {str(tool_args)[:50]}"
+        return _tool_detail_formatter(tool_name)(tool_args)
     
     def _generate_agent_summary(
         self, agent_name: str, context: CallbackContext, iteration: int
@@ -323,8 +333,9 @@ class ObservabilityPlugin(BasePlugin):
         self.metrics["warnings"].append({
             "warning": warning,
             "context": context,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         })
+        self._flush_console()
         console.print(f"[yellow]⚠️  {warning}[/yellow]")
     
     def log_error(self, error: str, context: str = ""):
@@ -332,14 +343,16 @@ class ObservabilityPlugin(BasePlugin):
         self.metrics["errors"].append({
             "error": error,
             "context": context,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         })
+        self._flush_console()
         console.print(f"[red]❌ Error: {error}[/red]")
     
     # ==================== FINALIZATION ====================
     
     def finalize(self, total_duration: float) -> Path:
         """Finalize metrics and save to file."""
+        self._flush_console()
         self.metrics["end_time"] = datetime.now().isoformat()
         self.metrics["performance"]["total_planning_time"] = f"{total_duration:.2f}s"
         
@@ -349,9 +362,10 @@ class ObservabilityPlugin(BasePlugin):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_file = log_dir / f"metrics_{timestamp}.json"
         
-        with open(log_file, "w") as f:
-            json.dump(self.metrics, f, indent=2)
-            
-        console.print(f"\n📊 Metrics saved to: {log_file}")
+        # Serialized here (later log_error calls can't race the writer); the
+        # file itself is written in the background
+        _submit_metrics(log_file, self.metrics)
+        
+        console.print(f"\n📊 Writing metrics to: {log_file}")
         return log_file
 
@@ -0,0 +1,43 @@
+"""
+Cheap structural pre-filter for generated itineraries.
+
+Catches obviously broken itineraries (truncated output, no daily
+breakdown, no times or costs) in microseconds so the reviewer can
+reject them without spending a 20-30s Gemini call.
+"""
+
+import re
+from typing import List
+
+# (issue reported when missing, pattern that proves the feature is present)
+_FEATURES = [
+    ("No day-by-day breakdown", re.compile(r"\bday\s*1\b", re.IGNORECASE)),
+    ("Only a single day planned", re.compile(r"\bday\s*2\b", re.IGNORECASE)),
+    ("No activity times", re.compile(r"\b\d{1,2}(?::\d{2})?\s*(?:am|pm)\b|\b\d{1,2}:\d{2}\b", re.IGNORECASE)),
+    ("No cost estimates", re.compile(r"[$€£¥]\s*\d|\b\d+(?:\.\d+)?\s*(?:usd|eur|gbp|jpy|yen)\b", re.IGNORECASE)),
+]
+
+# Anything shorter is almost certainly a truncated or failed generation
+MIN_ITINERARY_CHARS = 500
+
+# Below this completeness the reviewer rejects without calling the model
+PRESCORE_REJECT_BELOW = 0.3
+
+
+def prefilter_issues(text: str) -> List[str]:
+    """Return the structural problems found in an itinerary's text"""
+    issues = []
+    if len(text) < MIN_ITINERARY_CHARS:
+        issues.append(f"Itinerary too short ({len(text)} chars)")
+    issues.extend(issue for issue, pattern in _FEATURES if not pattern.search(text))
+    return issues
+
+
+def prescore(text: str) -> float:
+    """
+    Structural completeness of an itinerary, 0.0 (empty) to 1.0.
+
+    Only checks that the expected building blocks exist - it says
+    nothing about the quality of the plan itself.
+    """
+    return 1.0 - len(prefilter_issues(text)) / (len(_FEATURES) + 1)
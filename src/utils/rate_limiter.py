@@ -0,0 +1,131 @@
+"""
+Proactive rate limiting for Gemini calls.
+
+Instead of firing requests and relying on the retry backoff after a 429
+(RETRY_EXP_BASE=7 can sleep for minutes), callers wait on a token bucket
+sized to the model's requests-per-minute / tokens-per-minute quota.
+"""
+
+import asyncio
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from src.config import Config
+
+
+class AsyncTokenBucket:
+    """
+    Async token bucket limiting requests (and optionally tokens) per minute.
+
+    A rate of 0 disables limiting, so callers can always wrap their calls
+    without checking whether throttling is configured.
+
+    The budget is shared process-wide, but asyncio locks bind to one event
+    loop, so each running loop gets its own lock (successive asyncio.run()
+    calls in the CLI and tests reuse the same bucket).
+    """
+
+    def __init__(
+        self,
+        rate_per_min: int,
+        burst: Optional[int] = None,
+        tokens_per_min: Optional[int] = None
+    ):
+        self.rate_per_min = rate_per_min
+        self.capacity = max(1, burst or rate_per_min or 1)
+        self.tokens_per_min = tokens_per_min or 0
+
+        self._requests = float(self.capacity)
+        self._token_budget = float(self.tokens_per_min)
+        self._updated = time.monotonic()
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate_per_min > 0
+
+    def _refill(self):
+        """Top up both buckets based on elapsed monotonic time."""
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+
+        self._requests = min(
+            self.capacity,
+            self._requests + elapsed * self.rate_per_min / 60
+        )
+        if self.tokens_per_min:
+            self._token_budget = min(
+                self.tokens_per_min,
+                self._token_budget + elapsed * self.tokens_per_min / 60
+            )
+
+    def _seconds_until_available(self, estimated_tokens: int) -> float:
+        """How long until one request and `estimated_tokens` fit the budget."""
+        wait = 0.0
+        if self._requests < 1:
+            wait = (1 - self._requests) * 60 / self.rate_per_min
+        if self.tokens_per_min and self._token_budget < estimated_tokens:
+            token_wait = (estimated_tokens - self._token_budget) * 60 / self.tokens_per_min
+            wait = max(wait, token_wait)
+        return wait
+
+    async def wait(self, estimated_tokens: int = 0):
+        """Block until a request slot (and token budget) is available."""
+        if not self.enabled:
+            return
+
+        # A single oversized request must not wait forever
+        if self.tokens_per_min:
+            estimated_tokens = min(estimated_tokens, self.tokens_per_min)
+
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+
+        # Holding the lock while sleeping keeps waiters in FIFO order
+        async with lock:
+            while True:
+                self._refill()
+                delay = self._seconds_until_available(estimated_tokens)
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+
+            self._requests -= 1
+            if self.tokens_per_min:
+                self._token_budget -= estimated_tokens
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int = 0):
+        """
+        Context manager form of wait().
+
+        Usage:
+            async with limiter.acquire(estimated_tokens=1500):
+                async for event in runner.run_async(...):
+                    ...
+        """
+        await self.wait(estimated_tokens)
+        yield
+
+
+# Shared limiter - the quota belongs to the API key, not to an agent instance
+_gemini_limiter: Optional[AsyncTokenBucket] = None
+
+
+def get_rate_limiter() -> AsyncTokenBucket:
+    """Get or create the process-wide Gemini rate limiter"""
+    global _gemini_limiter
+    if _gemini_limiter is None:
+        _gemini_limiter = AsyncTokenBucket(
+            Config.GEMINI_QPM,
+            burst=max(1, Config.GEMINI_QPM // 6),
+            tokens_per_min=Config.GEMINI_TPM
+        )
+    return _gemini_limiter
@@ -3,17 +3,32 @@ Cross-session memory management for The Argonauts.
 Enables persistence across multiple planning sessions.
 """
 
+import heapq
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from google.adk.sessions import InMemorySessionService
 from google.adk.memory import InMemoryMemoryService
 from rich.console import Console
 
+# Optional: C-accelerated JSON for session files
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 console = Console()
 
 
+def _read_json(path: Path) -> Any:
+    """Parse a session file (orjson when available - several times faster)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_bytes())
+
+
 class PersistentSessionManager:
     """
     Manages sessions with persistence to disk.
@@ -27,6 +42,9 @@ class PersistentSessionManager:
         self.in_memory_service = InMemorySessionService()
         self.memory_service = InMemoryMemoryService()
         
+        # session_id -> (mtime, summary or None until first read); built on first listing
+        self._index: Optional[Dict[str, Tuple[float, Optional[Dict[str, Any]]]]] = None
+        
         console.print(f"[dim]📁 Session storage: {self.storage_dir}[/dim]")
     
     def save_session(self, session_id: str, data: Dict[str, Any]):
@@ -36,8 +54,14 @@ class PersistentSessionManager:
         # Add metadata
         data["saved_at"] = datetime.now().isoformat()
         
-        with open(session_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Compact (machine-read) JSON, serialized once and written in one call
+        if ORJSON_AVAILABLE:
+            session_file.write_bytes(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        else:
+            session_file.write_bytes(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+        
+        if self._index is not None:
+            self._index[session_id] = (session_file.stat().st_mtime, self._summarize(session_id, data))
         
         console.print(f"\n[green]💾 Session saved: {session_file}[/green]")
     
@@ -48,36 +72,48 @@ class PersistentSessionManager:
         if not session_file.exists():
             return None
         
-        with open(session_file, 'r') as f:
-            data = json.load(f)
+        data = _read_json(session_file)
         
         console.print(f"[dim]📂 Session loaded: {session_id[:16]}...[/dim]")
         return data
     
+    @staticmethod
+    def _summarize(session_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Metadata shown in session listings"""
+        return {
+            "session_id": session_id,
+            "destination": data.get("destination", "Unknown"),
+            "dates": data.get("dates", "Unknown"),
+            "saved_at": data.get("saved_at", "Unknown")
+        }
+    
+    def _get_index(self) -> Dict[str, Tuple[float, Optional[Dict[str, Any]]]]:
+        """Scan the storage directory once; save_session keeps the index current afterwards"""
+        if self._index is None:
+            self._index = {
+                session_file.stem: (session_file.stat().st_mtime, None)
+                for session_file in self.storage_dir.glob("*.json")
+            }
+        return self._index
+    
     def list_sessions(self) -> List[str]:
         """List all saved sessions"""
-        sessions = []
-        for session_file in self.storage_dir.glob("*.json"):
-            sessions.append(session_file.stem)
-        return sorted(sessions, reverse=True)
+        return sorted(self._get_index(), reverse=True)
     
     def get_recent_sessions(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Get recent sessions with metadata"""
+        index = self._get_index()
         sessions = []
         
-        for session_file in sorted(
-            self.storage_dir.glob("*.json"),
-            key=lambda p: p.stat().st_mtime,
-            reverse=True
-        )[:limit]:
-            with open(session_file, 'r') as f:
-                data = json.load(f)
-                sessions.append({
-                    "session_id": session_file.stem,
-                    "destination": data.get("destination", "Unknown"),
-                    "dates": data.get("dates", "Unknown"),
-                    "saved_at": data.get("saved_at", "Unknown")
-                })
+        for session_id, (mtime, summary) in heapq.nlargest(
+            limit, index.items(), key=lambda item: item[1][0]
+        ):
+            if summary is None:
+                # Only sessions from before this process need a read, and only once
+                data = _read_json(self.storage_dir / f"{session_id}.json")
+                summary = self._summarize(session_id, data)
+                index[session_id] = (mtime, summary)
+            sessions.append(summary)
         
         return sessions
     
@@ -0,0 +1,81 @@
+"""
+Shared fixtures for The Argonauts tests.
+Sample trip objects are built once per test session - treat them as read-only.
+"""
+
+import pytest
+
+from models.trip_models import TripInput, TripDates, TripPreferences, TripItinerary, DayPlan
+from tools.file_parser import parse_reference_files
+
+
+@pytest.fixture(scope="session")
+def ten_day_dates():
+    """April 1-10, 2026 - parsed once and shared by the date tests"""
+    return TripDates(start_date="2026-04-01", end_date="2026-04-10")
+
+
+@pytest.fixture(scope="session")
+def tokyo_trip_input():
+    """Canonical 5-day Tokyo trip"""
+    return TripInput(
+        destination="Tokyo",
+        dates=TripDates(start_date="2026-04-01", end_date="2026-04-05"),
+        preferences=TripPreferences(
+            interests=["culture", "food"],
+            budget_level="mid-range"
+        )
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_day_plan():
+    """Arrival day for the Tokyo trip"""
+    return DayPlan(
+        day_number=1,
+        date="2026-04-01",
+        title="Day 1: Arrival",
+        morning_activities=["Check in hotel"],
+        afternoon_activities=["Explore neighborhood"],
+        evening_activities=["Dinner"],
+        meals={"dinner": "Local ramen"},
+        estimated_cost=100.0
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_itinerary(tokyo_trip_input, sample_day_plan):
+    """Itinerary for the Tokyo trip with one planned day"""
+    return TripItinerary(
+        trip_input=tokyo_trip_input,
+        destination="Tokyo",
+        start_date="2026-04-01",
+        end_date="2026-04-05",
+        duration_days=5,
+        day_plans=[sample_day_plan],
+        generated_itinerary="Test itinerary content",
+        total_estimated_cost=1500.0
+    )
+
+
+@pytest.fixture(scope="session")
+def lite_agents():
+    """(Research, Planning, Review) agent classes for flash-lite models"""
+    from src.agents.lite_model import ResearchAgentLite, PlanningAgentLite, ReviewAgentLite
+    return ResearchAgentLite, PlanningAgentLite, ReviewAgentLite
+
+
+@pytest.fixture(scope="session")
+def pro_agents():
+    """(Research, Planning, Review) agent classes for advanced models"""
+    from src.agents.pro_model import ResearchAgentPro, PlanningAgentPro, ReviewAgentPro
+    return ResearchAgentPro, PlanningAgentPro, ReviewAgentPro
+
+
+@pytest.fixture(scope="session")
+def parsed_reference_files(tmp_path_factory):
+    """Two small text references, written and parsed once per session"""
+    refs = tmp_path_factory.mktemp("refs")
+    (refs / "a.txt").write_text("Content from file 1")
+    (refs / "b.txt").write_text("Content from file 2")
+    return parse_reference_files([str(refs / "a.txt"), str(refs / "b.txt")])
@@ -3,33 +3,18 @@ Tests for dynamic agent loading system.
 """
 
 import pytest
-import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
-from config import Config
 
 
 class TestAgentImports:
     """Test that agent modules can be imported"""
     
-    def test_lite_agents_import(self):
+    def test_lite_agents_import(self, lite_agents):
         """Test that lite agents can be imported"""
-        from src.agents.lite_model import ResearchAgentLite, PlanningAgentLite, ReviewAgentLite
-        
-        assert ResearchAgentLite is not None
-        assert PlanningAgentLite is not None
-        assert ReviewAgentLite is not None
+        assert all(agent is not None for agent in lite_agents)
     
-    def test_pro_agents_import(self):
+    def test_pro_agents_import(self, pro_agents):
         """Test that pro agents can be imported"""
-        from src.agents.pro_model import ResearchAgentPro, PlanningAgentPro, ReviewAgentPro
-        
-        assert ResearchAgentPro is not None
-        assert PlanningAgentPro is not None
-        assert ReviewAgentPro is not None
+        assert all(agent is not None for agent in pro_agents)
     
     def test_orchestrator_import(self):
         """Test that orchestrator can be imported"""
@@ -47,31 +32,25 @@ class TestAgentImports:
 class TestAgentClasses:
     """Test agent class structure"""
     
-    def test_lite_agents_have_required_attributes(self):
+    def test_lite_agents_have_required_attributes(self, lite_agents):
         """Test that lite agents have required structure"""
-        from src.agents.lite_model import ResearchAgentLite, PlanningAgentLite, ReviewAgentLite
-        
         # Check class names are correct
-        assert ResearchAgentLite.__name__ == "ResearchAgentLite"
-        assert PlanningAgentLite.__name__ == "PlanningAgentLite"
-        assert ReviewAgentLite.__name__ == "ReviewAgentLite"
+        assert [agent.__name__ for agent in lite_agents] == [
+            "ResearchAgentLite", "PlanningAgentLite", "ReviewAgentLite"
+        ]
     
-    def test_pro_agents_have_required_attributes(self):
+    def test_pro_agents_have_required_attributes(self, pro_agents):
         """Test that pro agents have required structure"""
-        from src.agents.pro_model import ResearchAgentPro, PlanningAgentPro, ReviewAgentPro
-        
         # Check class names are correct
-        assert ResearchAgentPro.__name__ == "ResearchAgentPro"
-        assert PlanningAgentPro.__name__ == "PlanningAgentPro"
-        assert ReviewAgentPro.__name__ == "ReviewAgentPro"
+        assert [agent.__name__ for agent in pro_agents] == [
+            "ResearchAgentPro", "PlanningAgentPro", "ReviewAgentPro"
+        ]
     
-    def test_lite_and_pro_are_different_classes(self):
+    def test_lite_and_pro_are_different_classes(self, lite_agents, pro_agents):
         """Test that lite and pro agents are actually different"""
-        from src.agents.lite_model import ResearchAgentLite
-        from src.agents.pro_model import ResearchAgentPro
-        
-        assert ResearchAgentLite != ResearchAgentPro
-        assert ResearchAgentLite.__name__ != ResearchAgentPro.__name__
+        for lite, pro in zip(lite_agents, pro_agents):
+            assert lite is not pro
+            assert lite.__name__ != pro.__name__
 
 
 class TestDynamicLoading:
@@ -84,43 +63,19 @@ class TestDynamicLoading:
         assert load_agents_for_model is not None
         assert callable(load_agents_for_model)
     
-    def test_lite_model_loads_lite_agents(self):
-        """Test that lite model loads lite agents"""
-        from src.agents.orchestrator_capstone import load_agents_for_model
-        
-        original_model = Config.MODEL_NAME
-        
-        try:
-            Config.MODEL_NAME = "gemini-2.5-flash-lite"
-            ResearchAgent, PlanningAgent, ReviewAgent = load_agents_for_model()
-            
-            # Check that we got Lite versions
-            assert "Lite" in ResearchAgent.__name__
-            assert "Lite" in PlanningAgent.__name__
-            assert "Lite" in ReviewAgent.__name__
-        finally:
-            Config.MODEL_NAME = original_model
-    
-    def test_pro_model_loads_pro_agents(self):
-        """Test that pro model loads pro agents"""
-        # Import Config from the SAME place orchestrator imports it
+    @pytest.mark.parametrize("model_name,expected", [
+        ("gemini-2.5-flash-lite", "lite_agents"),
+        ("gemini-2.5-flash", "pro_agents"),
+    ])
+    def test_model_tier_loads_matching_agents(self, request, monkeypatch, model_name, expected):
+        """Test that lite models load lite agents and others load pro agents"""
+        # Patch Config in the SAME module the orchestrator imports it from
         import src.config
         from src.agents.orchestrator_capstone import load_agents_for_model
         
-        original_model = src.config.Config.MODEL_NAME
-        
-        try:
-            # Change Config in the module that orchestrator actually uses
-            src.config.Config.MODEL_NAME = "gemini-2.5-flash"
-            
-            ResearchAgent, PlanningAgent, ReviewAgent = load_agents_for_model()
-            
-            # Check that we got Pro versions
-            assert "Pro" in ResearchAgent.__name__
-            assert "Pro" in PlanningAgent.__name__
-            assert "Pro" in ReviewAgent.__name__
-        finally:
-            src.config.Config.MODEL_NAME = original_model
+        monkeypatch.setattr(src.config.Config, "MODEL_NAME", model_name)
+        
+        assert load_agents_for_model() == request.getfixturevalue(expected)
     
     def test_loading_returns_three_classes(self):
         """Test that loading returns exactly three agent classes"""
@@ -135,3 +90,74 @@ class TestDynamicLoading:
         for agent_class in result:
             assert isinstance(agent_class, type)
 
+
+class TestReviewSessions:
+    """Test how the pro reviewer assigns sessions to refinement runs"""
+    
+    def test_sessions_keyed_by_run(self, tokyo_trip_input):
+        """Test concurrent reviews of one run share a session and other runs get their own"""
+        import asyncio
+        from src.agents.pro_model.review_agent import ReviewAgentPro
+        
+        created = []
+        
+        class SlowSessionService:
+            async def create_session(self, app_name, user_id):
+                await asyncio.sleep(0)  # Yield so concurrent callers interleave
+                created.append(user_id)
+                return type("Session", (), {"id": f"s{len(created)}"})()
+        
+        reviewer = ReviewAgentPro.__new__(ReviewAgentPro)  # Skip building the ADK stack
+        reviewer.app_name = "test"
+        reviewer.session_service = SlowSessionService()
+        reviewer._sessions = {}
+        
+        async def run():
+            same_run = await asyncio.gather(*(
+                reviewer._get_or_create_session(tokyo_trip_input, "run_a") for _ in range(3)
+            ))
+            other_run = await reviewer._get_or_create_session(tokyo_trip_input, "run_b")
+            unkeyed = await reviewer._get_or_create_session(tokyo_trip_input)
+            return same_run, other_run, unkeyed
+        
+        same_run, other_run, unkeyed = asyncio.run(run())
+        
+        assert len(set(same_run)) == 1
+        assert len({same_run[0], other_run, unkeyed}) == 3
+        assert len(created) == 3
+    
+    def test_refinement_diff_only_covers_text_sent(self, tokyo_trip_input, sample_itinerary):
+        """Test the refinement diff is taken between the truncated texts the reviewer saw"""
+        from src.agents.pro_model.review_agent import ReviewAgentPro
+        
+        reviewer = ReviewAgentPro.__new__(ReviewAgentPro)
+        reviewer.max_iterations = 3
+        reviewer._last_itinerary_text = {}
+        
+        head = "".join(f"Day {i}: temple visit and ramen dinner.\n" for i in range(60))  # > 2000 chars
+        
+        def query(text, iteration):
+            itinerary = sample_itinerary.model_copy(update={"generated_itinerary": text})
+            return reviewer._create_review_query(tokyo_trip_input, itinerary, iteration, "s1")
+        
+        query(head + "Tail A\n", 1)
+        # Only text past the cut changed: the reviewer never saw it, so no diff
+        assert "unified diff" not in query(head + "Tail B\n", 2)
+        # A change inside the sent text is diffed, without anything past the cut
+        edited = query(head.replace("Day 3: temple", "Day 3: museum") + "Tail C\n", 3)
+        assert "unified diff" in edited and "+Day 3: museum" in edited
+        assert "Tail" not in edited
+    
+    @pytest.mark.filterwarnings(r"ignore:\[EXPERIMENTAL\]")
+    def test_review_stack_keyed_on_context_cache_flag(self, monkeypatch):
+        """Test toggling ENABLE_CONTEXT_CACHE builds a new review stack instead of reusing the cached one"""
+        import src.config
+        from src.agents.pro_model.review_agent import ReviewAgentPro
+        
+        monkeypatch.setattr(src.config.Config, "ENABLE_CONTEXT_CACHE", True)
+        cached = ReviewAgentPro().runner
+        monkeypatch.setattr(src.config.Config, "ENABLE_CONTEXT_CACHE", False)
+        uncached = ReviewAgentPro().runner
+        
+        assert cached.context_cache_config is not None
+        assert uncached.context_cache_config is None
@@ -4,45 +4,44 @@ Run with: python3 -m pytest tests/
 """
 
 import pytest
-import sys
+import gzip
+import os
+import re
+import time
 from pathlib import Path
 from datetime import date
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
-from models.trip_models import TripInput, TripDates, TripPreferences
+from models.trip_models import TripInput, TripItinerary, ReviewResult
 from tools.maps_helper import MapsHelper
 from tools.transport_helper import TransportHelper
-from utils.error_handler import validate_trip_input, InvalidInputError
+from tools.itinerary_formatter import ItineraryFormatter
+from src.utils.rate_limiter import AsyncTokenBucket
+from src.utils.prefilter import prefilter_issues, prescore, PRESCORE_REJECT_BELOW
+from src.utils.observability import (
+    _METRICS_WRITER, _serialize_metrics, _submit_metrics, _write_metrics
+)
+
+# Shinkansen fare, with or without the thousands separator
+TOKYO_KYOTO_FARE = re.compile(r"13,?320")
 
 
 class TestModels:
     """Test data models"""
     
-    def test_trip_dates_creation(self):
+    def test_trip_dates_creation(self, ten_day_dates):
         """Test TripDates model"""
-        dates = TripDates(
-            start_date="2026-04-01",
-            end_date="2026-04-10"
-        )
-        assert dates.duration_days == 10
+        assert ten_day_dates.duration_days == 10
+    
+    def test_models_build_serializers_at_import(self):
+        """Test models are fully built at class creation (no lazy rebuild on first export)"""
+        for model in (TripInput, TripItinerary, ReviewResult):
+            assert model.__pydantic_complete__
     
-    def test_trip_input_creation(self):
+    def test_trip_input_creation(self, tokyo_trip_input):
         """Test TripInput model"""
-        trip = TripInput(
-            destination="Tokyo",
-            dates=TripDates(
-                start_date="2026-04-01",
-                end_date="2026-04-10"
-            ),
-            preferences=TripPreferences(
-                interests=["culture", "food"],
-                budget_level="mid-range"
-            )
-        )
-        assert trip.destination == "Tokyo"
-        assert trip.dates.duration_days == 10
+        assert tokyo_trip_input.destination == "Tokyo"
+        assert tokyo_trip_input.dates.duration_days == 5
+        assert tokyo_trip_input.preferences.budget_level == "mid-range"
 
 
 class TestMapsHelper:
@@ -52,7 +51,7 @@ class TestMapsHelper:
         """Test Maps search URL"""
         url = MapsHelper.search_url("Senso-ji Temple", "Tokyo")
         assert "google.com/maps" in url
-        assert "Senso-ji" in url or "Senso%20ji" in url or "Senso-ji" in url
+        assert any(s in url for s in ("Senso-ji", "Senso%20ji", "Senso ji"))
     
     def test_directions_url(self):
         """Test directions URL"""
@@ -72,40 +71,182 @@ class TestTransportHelper:
         assert len(info["passes"]) > 0
         assert any("Suica" in p["name"] for p in info["passes"])
     
+    def test_recommendations_are_plain_copies(self):
+        """Test recommendations serialize to JSON and edits don't leak into the shared table"""
+        import json
+        
+        info = TransportHelper.get_transit_recommendations("Tokyo", 3)
+        assert json.loads(json.dumps(info)) == info
+        
+        info["passes"][0]["name"] = "Edited"
+        assert TransportHelper.get_transit_recommendations("Tokyo", 3)["passes"][0]["name"] == "Suica Card"
+        assert TransportHelper.TRANSIT_PASSES["tokyo"]["passes"][0]["name"] == "Suica Card"
+    
     def test_japan_overview(self):
         """Test multi-city Japan transit"""
         guide = TransportHelper.get_japan_transit_overview(["Tokyo", "Kyoto", "Osaka"])
         assert "JR Pass" in guide
         assert "Shinkansen" in guide
-        assert "13,320" in guide or "13320" in guide  # Tokyo-Kyoto cost
-
-
-class TestErrorHandling:
-    """Test error handling"""
-    
-    def test_validate_valid_input(self):
-        """Test validation passes for valid input"""
-        trip = TripInput(
-            destination="Tokyo",
-            dates=TripDates(
-                start_date="2026-04-01",
-                end_date="2026-04-10"
-            )
-        )
-        validate_trip_input(trip)  # Should not raise
-    
-    def test_validate_invalid_duration(self):
-        """Test validation fails for invalid duration"""
-        trip = TripInput(
-            destination="Tokyo",
-            dates=TripDates(
-                start_date="2026-04-10",
-                end_date="2026-04-01"  # End before start
-            )
-        )
-        # Should raise InvalidInputError
-        with pytest.raises(InvalidInputError):
-            validate_trip_input(trip)
+        assert TOKYO_KYOTO_FARE.search(guide)  # Tokyo-Kyoto cost
+
+
+class TestItineraryFormatter:
+    """Test markdown itinerary formatting"""
+    
+    @pytest.mark.parametrize("generated,uses_generated", [
+        ("x" * 101, True),
+        ("  \n" + "x" * 101 + "\n\n", True),
+        (" " * 200, False),  # Whitespace only
+        ("\n" * 100 + "x" * 50 + " " * 100, False),  # Short once stripped
+        ("\u3000" * 100 + "x" * 50 + "\u3000" * 100, False),  # Unicode (ideographic) spaces
+        ("x" * 100, False),  # Needs more than 100 characters
+    ])
+    def test_generated_text_needs_100_visible_chars(self, sample_itinerary, generated, uses_generated):
+        """Test the LLM text is used only past 100 non-edge-whitespace chars, else day plans"""
+        itinerary = sample_itinerary.model_copy(update={"generated_itinerary": generated})
+        md = ItineraryFormatter.to_markdown(itinerary)
+        
+        assert (generated in md) == uses_generated
+        assert ("### Day 1:" in md) != uses_generated
+
+
+class TestRateLimiter:
+    """Test proactive Gemini rate limiting"""
+    
+    def test_burst_then_throttle(self):
+        """Test requests beyond the burst wait for a refill"""
+        import asyncio
+        import time
+        
+        bucket = AsyncTokenBucket(600, burst=1)  # 1 request per 0.1s
+        
+        async def run():
+            start = time.monotonic()
+            for _ in range(3):
+                async with bucket.acquire():
+                    pass
+            return time.monotonic() - start
+        
+        elapsed = asyncio.run(run())
+        assert elapsed >= 0.15
+    
+    def test_disabled_bucket_never_waits(self):
+        """Test a zero rate disables limiting"""
+        import asyncio
+        
+        bucket = AsyncTokenBucket(0)
+        
+        async def run():
+            for _ in range(100):
+                await bucket.wait(estimated_tokens=10_000)
+        
+        asyncio.run(run())
+        assert not bucket.enabled
+    
+    def test_shared_bucket_survives_new_event_loop(self):
+        """Test a bucket contended in one asyncio.run() still works in the next"""
+        import asyncio
+        
+        bucket = AsyncTokenBucket(6000, burst=1)  # 1 request per 0.01s
+        
+        async def run():
+            await asyncio.gather(*(bucket.wait() for _ in range(3)))
+        
+        asyncio.run(run())
+        asyncio.run(run())  # Would raise "bound to a different event loop"
+
+
+class TestPrefilter:
+    """Test the structural itinerary pre-filter"""
+    
+    def test_complete_itinerary_scores_full(self):
+        """Test an itinerary with days, times and costs passes"""
+        day = "Day {n}: 9:00 AM temple visit ($15), 1:00 PM lunch ($20), 7 PM dinner.\n"
+        text = "".join(day.format(n=n) for n in range(1, 11))
+        assert prefilter_issues(text) == []
+        assert prescore(text) == 1.0
+    
+    def test_broken_itinerary_rejected(self):
+        """Test a truncated, unstructured itinerary falls below the threshold"""
+        text = "I could not generate an itinerary for this trip."
+        assert prescore(text) < PRESCORE_REJECT_BELOW
+        assert "No day-by-day breakdown" in prefilter_issues(text)
+
+
+class TestSessionManager:
+    """Test session persistence and listing"""
+    
+    def test_recent_sessions_served_from_index(self, tmp_path, monkeypatch):
+        """Test listings scan the directory once and reflect later saves without re-reading files"""
+        # Imported here: session_manager pulls in the ADK session services
+        from src.utils.session_manager import PersistentSessionManager
+        
+        manager = PersistentSessionManager(storage_dir=str(tmp_path))
+        manager.save_session("session_a", {"destination": "Tokyo"})
+        os.utime(tmp_path / "session_a.json", (0, 0))  # Older than the next save on any filesystem
+        assert manager.list_sessions() == ["session_a"]
+        
+        manager.save_session("session_b", {"destination": "Kyoto"})
+        
+        def no_rescan(*args, **kwargs):
+            raise AssertionError("storage directory rescanned")
+        
+        monkeypatch.setattr(Path, "glob", no_rescan)
+        recent = manager.get_recent_sessions(limit=5)
+        assert [s["destination"] for s in recent] == ["Kyoto", "Tokyo"]
+        assert manager.list_sessions() == ["session_b", "session_a"]
+
+
+class TestMetricsLogs:
+    """Test metrics file rotation"""
+    
+    def test_previous_runs_compressed_and_expired(self, tmp_path):
+        """Test earlier metrics are gzipped and archives past retention are deleted"""
+        an_hour_ago = time.time() - 3600
+        previous = tmp_path / "metrics_20250101_000000.json"
+        previous.write_text('{"session_id": "old"}')
+        os.utime(previous, (an_hour_ago, an_hour_ago))
+        expired = tmp_path / "metrics_20200101_000000.json.gz"
+        expired.write_bytes(b"")
+        os.utime(expired, (0, 0))
+        
+        latest = tmp_path / "metrics_20250102_000000.json"
+        _write_metrics(latest, _serialize_metrics({"session_id": "new"}))
+        
+        assert latest.exists()
+        assert not previous.exists()
+        assert gzip.decompress((tmp_path / "metrics_20250101_000000.json.gz").read_bytes()) == b'{"session_id": "old"}'
+        assert not expired.exists()
+    
+    def test_current_run_and_existing_archives_left_alone(self, tmp_path):
+        """Test files from this run stay uncompressed and archives are never overwritten"""
+        an_hour_ago = time.time() - 3600
+        sibling = tmp_path / "metrics_20250102_000000.json"  # Other writer, same run
+        sibling.write_text('{"session_id": "plugin"}')
+        clash = tmp_path / "metrics_20250101_000000.json"  # Same-second earlier run
+        clash.write_text('{"session_id": "second"}')
+        os.utime(clash, (an_hour_ago, an_hour_ago))
+        archive = tmp_path / "metrics_20250101_000000.json.gz"
+        archive.write_bytes(gzip.compress(b'{"session_id": "first"}'))
+        
+        _write_metrics(tmp_path / "metrics_20250102_000001.json", _serialize_metrics({}))
+        
+        assert sibling.exists()
+        assert clash.exists()
+        assert gzip.decompress(archive.read_bytes()) == b'{"session_id": "first"}'
+    
+    def test_background_write_snapshots_and_reports_failure(self, tmp_path, caplog):
+        """Test metrics are serialized at submit time and a failed write is logged"""
+        metrics = {"errors": []}
+        log_file = tmp_path / "metrics_20250101_000000.json"
+        future = _submit_metrics(log_file, metrics)
+        metrics["errors"].append("after submit")  # Must not reach the file
+        future.result()
+        assert log_file.read_bytes() == _serialize_metrics({"errors": []})
+        
+        _submit_metrics(tmp_path / "missing" / "metrics.json", metrics)
+        _METRICS_WRITER.submit(lambda: None).result()  # Single worker: runs after the callback
+        assert "Could not write metrics" in caplog.text
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+"""
+Tests for the trip planner evaluator.
+"""
+
+import asyncio
+import pytest
+
+from models.trip_models import ReviewResult
+from src.evaluation.evaluator import evaluate_batch
+
+
+class StubReviewer:
+    """Reviewer that records concurrency; later cases finish first"""
+    
+    def __init__(self, fail_on: str = None):
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def review(self, trip_input, itinerary):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            case = int(itinerary.generated_itinerary.split()[-1])
+            await asyncio.sleep(0.01 * (10 - case))
+            if itinerary.generated_itinerary == self.fail_on:
+                raise RuntimeError("review failed")
+            return ReviewResult(
+                approved=True,
+                quality_score=float(case),
+                issues_found=[],
+                suggestions=[],
+                review_summary="ok",
+                iteration_number=1
+            )
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def batch_cases(tokyo_trip_input, sample_itinerary):
+    """Six (trip, itinerary, metrics) cases whose itineraries end in their index"""
+    return [
+        (tokyo_trip_input, sample_itinerary.model_copy(update={"generated_itinerary": f"case {i}"}), {})
+        for i in range(6)
+    ]
+
+
+class TestEvaluateBatch:
+    """Test concurrent batch evaluation"""
+    
+    def test_results_in_input_order_under_cap(self, batch_cases):
+        """Test results follow input order and reviews never exceed the concurrency cap"""
+        reviewer = StubReviewer()
+        progress = []
+        
+        results = asyncio.run(evaluate_batch(
+            batch_cases, reviewer=reviewer, concurrency=2,
+            on_progress=lambda done, total: progress.append((done, total))
+        ))
+        
+        assert [r["review"]["quality_score"] for r in results] == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+        assert reviewer.max_in_flight == 2
+        assert progress == [(i, 6) for i in range(1, 7)]
+    
+    def test_review_error_propagates(self, batch_cases):
+        """Test a failing review raises from evaluate_batch and cancels the rest"""
+        reviewer = StubReviewer(fail_on="case 4")
+        
+        async def run():
+            with pytest.raises(RuntimeError, match="review failed"):
+                await evaluate_batch(batch_cases, reviewer=reviewer, concurrency=6)
+            await asyncio.sleep(0)  # Let cancellations land
+            return reviewer.in_flight
+        
+        assert asyncio.run(run()) == 0
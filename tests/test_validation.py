@@ -0,0 +1,31 @@
+"""
+Tests for trip input validation.
+"""
+
+import pytest
+
+from models.trip_models import TripInput, TripDates
+from utils.error_handler import validate_trip_input, InvalidInputError
+
+
+class TestTripValidation:
+    """Test validate_trip_input"""
+    
+    def test_validate_valid_input(self, tokyo_trip_input):
+        """Test validation passes for valid input"""
+        validate_trip_input(tokyo_trip_input)  # Should not raise
+    
+    @pytest.mark.parametrize("destination,start_date,end_date,message", [
+        ("Tokyo", "2026-04-10", "2026-04-01", "End date must be after start date"),
+        ("", "2026-04-01", "2026-04-10", "Destination is required"),
+        ("Tokyo", "2026-01-01", "2027-01-01", "cannot exceed 365 days"),
+    ])
+    def test_invalid_input_rejected(self, destination, start_date, end_date, message):
+        """Test each invalid trip is rejected with a specific message"""
+        trip = TripInput(
+            destination=destination,
+            dates=TripDates(start_date=start_date, end_date=end_date)
+        )
+        
+        with pytest.raises(InvalidInputError, match=message):
+            validate_trip_input(trip)